@@ -0,0 +1,95 @@
+"""Microbenchmark of WemPortalDataMapper.process_api_values.
+
+Compares mapping a DataAccess/Read response of a synthetic catalog with the
+mapping plan compiled on every cycle against a plan compiled once.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_mapper [parameters] [rounds]
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+
+from custom_components.wemportal.const import WemDataType
+from custom_components.wemportal.mapper import (
+    WemPortalDataMapper,
+    compile_mapping_plan,
+)
+
+DEVICE_ID = "1234"
+MODULE_NAMES = ["Heizkreis", "Warmwasser", "Waermepumpe", "Zusatzwaermeerzeuger", "System"]
+# (DataType, IsWriteable, extra metadata, unit, value)
+PARAMETER_KINDS = [
+    (WemDataType.NUMBER_STEP_HALF, False, {}, "°C", {"NumericValue": 21.5}),
+    (WemDataType.NUMBER_STEP_HALF, True, {"MinValue": 10, "MaxValue": 30}, "°C", {"NumericValue": 20.0}),
+    (
+        WemDataType.SELECT,
+        True,
+        {"EnumValues": [{"Value": 1, "Name": "Aus"}, {"Value": 2, "Name": "Ein"}]},
+        None,
+        {"NumericValue": 1, "StringValue": "Aus"},
+    ),
+    (WemDataType.SWITCH, True, {"MinValue": 0, "MaxValue": 1}, None, {"NumericValue": 1}),
+    (WemDataType.NUMBER_STEP_ONE, False, {}, "%", {"StringValue": "--"}),
+]
+
+
+def build_catalog(parameters: int) -> tuple[dict, dict]:
+    """Return a modules dict and a DataAccess/Read response with ``parameters`` values."""
+    modules = {}
+    values = {"Modules": []}
+    for index in range(parameters):
+        module_index = index % len(MODULE_NAMES)
+        data_type, writeable, extra, unit, value = PARAMETER_KINDS[index % len(PARAMETER_KINDS)]
+        module = modules.setdefault(
+            (module_index, 1),
+            {"Index": module_index, "Type": 1, "Name": MODULE_NAMES[module_index], "parameters": {}},
+        )
+        param_id = f"Parameter{index}"
+        module["parameters"][param_id] = {
+            "ParameterID": param_id,
+            "DataType": data_type,
+            "IsWriteable": writeable,
+            **extra,
+        }
+        if len(values["Modules"]) <= module_index:
+            values["Modules"].append({"ModuleIndex": module_index, "ModuleType": 1, "Values": []})
+        values["Modules"][module_index]["Values"].append(
+            {"ParameterID": param_id, "Unit": unit, **value}
+        )
+    return {DEVICE_ID: modules}, values
+
+
+def main(parameters: int = 600, rounds: int = 50) -> None:
+    modules, values = build_catalog(parameters)
+    plan = compile_mapping_plan(modules[DEVICE_ID], "en")
+
+    def run(mapping_plan):
+        WemPortalDataMapper.process_api_values(
+            device_id=DEVICE_ID,
+            values_json=values,
+            modules_dict=modules,
+            language="en",
+            scraping_mapper={},
+            mode="api",
+            api_data={DEVICE_ID: {}},
+            mapping_plan=mapping_plan,
+        )
+
+    per_cycle = min(timeit.repeat(lambda: run(None), number=rounds, repeat=3)) / rounds
+    precompiled = min(timeit.repeat(lambda: run(plan), number=rounds, repeat=3)) / rounds
+    compile_once = min(
+        timeit.repeat(lambda: compile_mapping_plan(modules[DEVICE_ID], "en"), number=rounds, repeat=3)
+    ) / rounds
+
+    print(f"{parameters} parameters, best of 3 x {rounds} rounds")
+    print(f"  plan compiled every cycle: {per_cycle * 1000:8.3f} ms/cycle")
+    print(f"  precompiled plan:          {precompiled * 1000:8.3f} ms/cycle")
+    print(f"  compiling the plan once:   {compile_once * 1000:8.3f} ms")
+    print(f"  speedup:                   {per_cycle / precompiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
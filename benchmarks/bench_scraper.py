@@ -0,0 +1,187 @@
+"""Benchmark of WemPortalScraper.parse_expert_page.
+
+Parses a synthetic Expert page with the markup of the WEM Portal (Telerik
+RadPanelBar panels of simpleData tables and a large ViewState). It compares
+the previous parser (XPath strings evaluated per panel and row, icon mapper
+and keyword scans rebuilt per row) with the compiled parser, and checks that
+both give identical output.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scraper [rows per panel] [rounds]
+"""
+from __future__ import annotations
+
+import base64
+import os
+import sys
+import timeit
+from collections import defaultdict
+
+from lxml import html
+
+from custom_components.wemportal.const import (
+    BOOLEAN_OFF_STRINGS,
+    BOOLEAN_ON_STRINGS,
+    ENERGY_POWER_KEYWORDS,
+    MISSING_DATA_STRINGS,
+    PERCENTAGE_KEYWORDS,
+    TEMPERATURE_KEYWORDS,
+)
+from custom_components.wemportal.scraper import WemPortalScraper
+
+PANELS = ["Wärmeerzeuger", "Heizkreis", "Heizkreis 2", "Warmwasser", "Solar", "Statistik - Energie"]
+ROWS = [
+    ("Vorlauftemperatur", "35,5 °C"),
+    ("Außentemperatur", "--"),
+    ("Leistungsanforderung", "45"),
+    ("Wärmemenge Heizen", "1234 kWh"),
+    ("Leistung", "--"),
+    ("Pumpe", "Aus"),
+    ("Brenner", "Ein"),
+    ("Betriebsart", "Automatik"),
+    ("Drehzahl", "1200"),
+    ("Anlagendruck", "1,8 bar"),
+    ("Status", "label ist null"),
+]
+
+
+def expert_page_parts(rows_per_panel: int = 40, viewstate_bytes: int = 200_000):
+    """Yield an Expert page piece by piece, as it arrives from the portal."""
+    yield "<html><head><title>WEM Portal</title></head><body><form>"
+    yield '<input type="hidden" id="__VIEWSTATE" value="'
+    for start in range(0, viewstate_bytes, 12_288):
+        yield base64.b64encode(os.urandom(min(12_288, viewstate_bytes - start))).decode()
+    yield '"/>'
+    yield '<input type="hidden" id="__EVENTVALIDATION" value="/wEdAAc="/>'
+    for panel in PANELS:
+        yield (
+            '<div class="RadPanelBar RadPanelBar_Default rpbSimpleData"><ul class="rpRootGroup"><li>'
+            '<table class="simpleDataHeaderTable"><tr>'
+            f'<th class="simpleDataHeaderTextCell"><span>{panel}</span></th></tr></table>'
+            '<div class="rpTemplate"><table class="simpleDataTable"><tbody>'
+        )
+        for index in range(rows_per_panel):
+            name, value = ROWS[index % len(ROWS)]
+            value_class = "simpleDataValueCell" if value[0].isdigit() else "simpleDataValueEnumCell"
+            yield (
+                f'<tr><td class="simpleDataNameCell"><span>{name} {index}</span></td>'
+                f'<td class="{value_class}"><span>{value}</span></td></tr>'
+            )
+        yield "</tbody></table></div></li></ul></div>"
+    yield "</form></body></html>"
+
+
+def expert_page(rows_per_panel: int = 40, viewstate_bytes: int = 200_000) -> str:
+    """Return an Expert page with the given number of rows per panel."""
+    return "".join(expert_page_parts(rows_per_panel, viewstate_bytes))
+
+
+def previous_parse_expert_page(html_content):
+    """parse_expert_page as it was before its XPaths were compiled."""
+    output = {}
+    tree = html.fromstring(html_content)
+
+    for div in tree.xpath('//div[contains(@class, "RadPanelBar RadPanelBar_Default rpbSimpleData")]'):
+        header_elems = div.xpath('.//th[contains(@class, "simpleDataHeaderTextCell")]/span/text()')
+        if not header_elems:
+            continue
+        header_raw = header_elems[0].strip()
+        header = (
+            header_elems[0].replace("/#", "")
+            .replace("  ", "")
+            .replace(" - ", "_")
+            .replace("/*+/*", "_")
+            .replace(" ", "_")
+            .casefold()
+        )
+
+        for td in div.xpath('.//div[contains(@class, "rpTemplate")]/table[contains(@class, "simpleDataTable")]/tbody/tr'):
+            try:
+                name_elems = td.xpath('.//td[contains(@class, "simpleDataNameCell")]/span/text()')
+                val_elems = td.xpath('.//td[contains(@class, "simpleDataValueCell") or contains(@class, "simpleDataValueEnumCell")]/span/text()')
+
+                if name_elems and val_elems:
+                    raw_name = name_elems[0].strip()
+                    friendly_name = f"{header_raw} - {raw_name.lstrip('- ')}"
+
+                    name = name_elems[0].replace("  ", "").replace(" ", "_").casefold()
+                    name = header + "-" + name
+                    original_value = val_elems[0].strip()
+                    value = original_value
+
+                    split_value = value.split(" ", 1)
+                    unit = ""
+                    if len(split_value) >= 2:
+                        value = split_value[0]
+                        unit = split_value[1]
+                    else:
+                        value = split_value[0]
+
+                    try:
+                        value = ".".join(value.split(","))
+                        value = float(value)
+                    except ValueError:
+                        value = original_value
+                        unit = None
+
+                    if not unit:
+                        name_lower = name.lower()
+                        if any(x in name_lower for x in TEMPERATURE_KEYWORDS):
+                            unit = '°C'
+                        elif any(x in name_lower for x in PERCENTAGE_KEYWORDS):
+                            unit = '%'
+
+                    value_lower = str(value).lower() if isinstance(value, str) else value
+                    if value_lower in MISSING_DATA_STRINGS:
+                        name_lower = name.lower()
+                        if any(x in name_lower for x in ENERGY_POWER_KEYWORDS):
+                            value = None
+                        else:
+                            value = 0.0
+                    elif value_lower in BOOLEAN_OFF_STRINGS:
+                        value = 0.0
+                    elif value_lower in BOOLEAN_ON_STRINGS:
+                        value = 1.0
+
+                    icon_mapper = defaultdict(lambda: "mdi:flash")
+                    icon_mapper["°C"] = "mdi:thermometer"
+
+                    output[name] = {
+                        "value": value,
+                        "name": name,
+                        "icon": icon_mapper[unit],
+                        "unit": unit,
+                        "platform": "sensor",
+                        "friendlyName": friendly_name,
+                        "ParameterID": name,
+                    }
+            except (IndexError, ValueError):
+                continue
+    return output
+
+
+def main(rows_per_panel: int = 40, rounds: int = 20) -> None:
+    page = expert_page(rows_per_panel)
+    scraper = WemPortalScraper("user", "password")
+    compiled = scraper.parse_expert_page(page)[0]
+    del compiled["cookie"]
+    assert compiled == previous_parse_expert_page(page)
+
+    results = {
+        "previous": previous_parse_expert_page,
+        "compiled XPath": scraper.parse_expert_page,
+    }
+    print(
+        f"{len(compiled)} rows in {len(PANELS)} panels, {len(page) // 1024} KiB page, "
+        f"best of 3 x {rounds} rounds, output identical"
+    )
+    baseline = None
+    for label, function in results.items():
+        seconds = min(timeit.repeat(lambda: function(page), number=rounds, repeat=3)) / rounds
+        baseline = baseline or seconds
+        print(f"  {label:16} {seconds * 1000:8.3f} ms/page  {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
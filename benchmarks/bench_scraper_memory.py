@@ -0,0 +1,107 @@
+"""Peak RSS of the HTML handling of one web scrape.
+
+A scrape downloads Default.aspx and the Expert tab, both carrying a large
+ViewState. The previous scraper held both response bodies, their decoded
+text and their complete lxml trees at once. The streaming scraper feeds the
+body chunk by chunk into an ExpertPageParser that keeps only the hidden
+form fields and the simpleData values.
+
+Every variant runs in its own process, because the peak RSS (VmHWM) of a
+process cannot be reset. The pages are generated chunk by chunk, like they
+arrive from the network.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scraper_memory [viewstate KiB] [rows per panel]
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from lxml import html
+
+from benchmarks.bench_scraper import expert_page_parts, previous_parse_expert_page
+from custom_components.wemportal.scraper import ExpertPageParser
+
+CHUNK_SIZE = 16_384
+
+
+def chunks(viewstate_kib: int, rows_per_panel: int):
+    """Yield the encoded page in network sized chunks."""
+    buffer = b""
+    for part in expert_page_parts(rows_per_panel, viewstate_kib * 1024):
+        buffer += part.encode()
+        while len(buffer) >= CHUNK_SIZE:
+            yield buffer[:CHUNK_SIZE]
+            buffer = buffer[CHUNK_SIZE:]
+    yield buffer
+
+
+def previous_scrape(viewstate_kib: int, rows_per_panel: int) -> int:
+    """Hold both pages as body, text and tree, like the previous scrape()."""
+    main_body = b"".join(chunks(viewstate_kib, rows_per_panel))
+    main_text = main_body.decode()
+    main_tree = html.fromstring(main_text)
+    main_tree.xpath("//*[@id='__VIEWSTATE']/@value")
+    expert_body = b"".join(chunks(viewstate_kib, rows_per_panel))
+    expert_text = expert_body.decode()
+    return len(previous_parse_expert_page(expert_text))
+
+
+def streaming_scrape(viewstate_kib: int, rows_per_panel: int) -> int:
+    """Stream both pages through an ExpertPageParser."""
+    output = {}
+    for _ in range(2):
+        parser = ExpertPageParser("utf-8")
+        for chunk in chunks(viewstate_kib, rows_per_panel):
+            parser.feed(chunk)
+        output = parser.close().output
+    return len(output)
+
+
+VARIANTS = {
+    "previous": previous_scrape,
+    "streaming": streaming_scrape,
+}
+
+
+def memory_kib(field: str) -> int:
+    """Return a memory field of /proc/self/status in KiB."""
+    with open("/proc/self/status", encoding="ascii") as status:
+        for line in status:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def run_variant(name: str, viewstate_kib: int, rows_per_panel: int) -> None:
+    """Run one variant and print its RSS growth above the idle process."""
+    # Warm up allocators and caches on a tiny page
+    VARIANTS[name](1, 1)
+    baseline = memory_kib("VmRSS")
+    rows = VARIANTS[name](viewstate_kib, rows_per_panel)
+    print(rows, memory_kib("VmHWM") - baseline)
+
+
+def main(viewstate_kib: int = 400, rows_per_panel: int = 40) -> None:
+    print(f"2 pages with a {viewstate_kib} KiB ViewState and {rows_per_panel} rows per panel")
+    baseline = None
+    for name in VARIANTS:
+        result = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.bench_scraper_memory",
+                "--variant", name, str(viewstate_kib), str(rows_per_panel),
+            ],
+            capture_output=True, check=True, text=True,
+        )
+        rows, peak = (int(value) for value in result.stdout.split())
+        baseline = baseline or peak
+        print(f"  {name:10} {rows:4} rows  peak RSS +{peak / 1024:7.1f} MiB  {baseline / max(peak, 1):5.1f}x")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--variant"]:
+        run_variant(sys.argv[2], *(int(arg) for arg in sys.argv[3:5]))
+    else:
+        main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,94 @@
+"""Benchmark of translations.translate.
+
+Translates every name of a parameter catalog: module names, parameter IDs
+through friendly_name_mapper, and scraped friendly names. It compares the
+previous algorithm (vocabulary rebuilt and sorted, one str.replace pass per
+entry on every call) with the compiled translator with and without its LRU
+memo. It also checks that all three give identical output.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_translate [rounds]
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+
+from custom_components.wemportal.translations import (
+    _VOCAB,
+    friendly_name_mapper,
+    translate,
+)
+
+MODULE_NAMES = [
+    "Heizkreis", "Heizkreis 2", "Warmwasser", "Wärmeerzeuger", "1.WEZ", "2.WEZ",
+    "WWP SG", "WWP EM HK", "Solar", "Statistik", "R130", "System",
+]
+PARAMETER_IDS = [
+    "Außentemperatur", "Aussentemperatur", "Vorlauftemperatur", "Rücklauftemperatur",
+    "Raumtemperatur", "AktRaumsoll", "AktWWSoll", "Warmwassertemperatur", "Kollektortemperatur",
+    "Anlagendruck", "Leistung", "Betriebsart", "Komfort", "Absenk", "Normal", "AbsenkWW",
+    "NormalWW", "PP_Beginn", "PP_Ende", "PP_Funktion", "PP_Raumsoll", "U_Beginn", "U_Ende",
+    "U_Funktion", "U_Raumsoll", "WW-Push", "WW-Programm", "Heizen Programm", "Kühlen Programm",
+    "Vorlauf Soll", "Rücklauf Ist", "Raum Soll", "Gesamt Energie Heizen", "Gesamt Energie Kühlen",
+    "El. Leistung", "Wärmeleistung Warmwasser", "Kühlenergie Mont", "Heizenergie Months",
+    "Compresso Consuption", "OAT", "CTT", "ICT", "IRT", "OMT", "LWT", "ODU Leistung",
+    "Switching_E2", "Wärmeerzeuger Betriebsstunden", "Erzeuger Druck", "Kollektor Temperatur",
+]
+
+
+def catalog() -> list[str]:
+    """Return every name the integration translates for the catalog above."""
+    names = [name.strip() for name in MODULE_NAMES]
+    names += [friendly_name_mapper(parameter) for parameter in PARAMETER_IDS]
+    names += [f"{module} {parameter}" for module in MODULE_NAMES for parameter in PARAMETER_IDS]
+    return names
+
+
+def previous_translate(language: str, value: str) -> str:
+    """translate() as it was before it was compiled."""
+    value = value.lower()
+    vocab = {language: dict(words) for language, words in _VOCAB.items()}
+    out = value
+    if language in vocab:
+        replacements = sorted(vocab[language].items(), key=lambda x: len(x[0]), reverse=True)
+        placeholders = {}
+        for i, (de_word, en_word) in enumerate(replacements):
+            if de_word in out:
+                placeholder = f"__TOKEN_{i}__"
+                placeholders[placeholder] = f" {en_word} "
+                out = out.replace(de_word, placeholder)
+        for placeholder, en_word in placeholders.items():
+            out = out.replace(placeholder, en_word)
+    out = out.replace("_", " ")
+    out = " ".join(out.split()).title()
+    out = out.replace("1St ", "1st ").replace("2Nd ", "2nd ")
+    return out
+
+
+def main(rounds: int = 20) -> None:
+    names = catalog()
+    compiled = translate.__wrapped__
+    for name in names:
+        assert previous_translate("en", name) == compiled("en", name) == translate("en", name), name
+
+    def run(function):
+        for name in names:
+            function("en", name)
+
+    results = {
+        "previous": previous_translate,
+        "compiled, no memo": compiled,
+        "compiled + LRU memo": translate,
+    }
+    print(f"{len(names)} names, best of 3 x {rounds} rounds, output identical")
+    baseline = None
+    for label, function in results.items():
+        seconds = min(timeit.repeat(lambda: run(function), number=rounds, repeat=3)) / rounds
+        baseline = baseline or seconds
+        print(f"  {label:20} {seconds * 1000:8.3f} ms/catalog  {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -11,17 +11,22 @@ import homeassistant.helpers.config_validation as config_validation
 import voluptuous as vol
 from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.config_entries import ConfigEntry
 from .const import (
     CONF_LANGUAGE,
     CONF_MODE,
     CONF_SCAN_INTERVAL_API,
+    CONF_SCAN_INTERVAL_FAST,
     DOMAIN,
     PLATFORMS,
     _LOGGER,
     DEFAULT_CONF_SCAN_INTERVAL_API_VALUE,
     DEFAULT_CONF_SCAN_INTERVAL_VALUE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
 from .coordinator import WemPortalDataUpdateCoordinator
 from .wemportalapi import WemPortalApi
@@ -109,21 +114,23 @@ async def migrate_unique_ids(
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the wemportal component."""
     # Set proper update_interval, based on selected mode
+    api_scan_interval = entry.options.get(
+        CONF_SCAN_INTERVAL_API, DEFAULT_CONF_SCAN_INTERVAL_API_VALUE
+    )
+    # The fast tier defaults to the API scan interval, like in WemPortalApi
+    fast_scan_interval = entry.options.get(CONF_SCAN_INTERVAL_FAST, api_scan_interval)
     if entry.options.get(CONF_MODE) == "web":
         update_interval = entry.options.get(
             CONF_SCAN_INTERVAL, DEFAULT_CONF_SCAN_INTERVAL_VALUE
         )
 
     elif entry.options.get(CONF_MODE) == "api":
-        update_interval = entry.options.get(
-            CONF_SCAN_INTERVAL_API, DEFAULT_CONF_SCAN_INTERVAL_API_VALUE
-        )
+        update_interval = min(api_scan_interval, fast_scan_interval)
     else:
         update_interval = min(
             entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_CONF_SCAN_INTERVAL_VALUE),
-            entry.options.get(
-                CONF_SCAN_INTERVAL_API, DEFAULT_CONF_SCAN_INTERVAL_API_VALUE
-            ),
+            api_scan_interval,
+            fast_scan_interval,
         )
 
     # Currently we only support one device so we will take first device id
@@ -144,12 +151,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     api = WemPortalApi(
         entry.data.get(CONF_USERNAME),
         entry.data.get(CONF_PASSWORD),
-        config=entry.options
+        config=entry.options,
+        # Dedicated session, so API login cookies stay out of the shared jar
+        session=async_create_clientsession(hass),
     )
     # Create custom coordinator
     coordinator = WemPortalDataUpdateCoordinator(
-        hass, api, entry, timedelta(seconds=update_interval)
+        hass,
+        api,
+        entry,
+        timedelta(seconds=update_interval),
+        store=Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}"),
     )
+    await coordinator.async_load_state()
+    coordinator.async_update_disabled_keys()
 
     await coordinator.async_config_entry_first_refresh()
 
@@ -174,6 +189,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
+    entry.async_on_unload(
+        hass.bus.async_listen(
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+            coordinator.async_handle_entity_registry_updated,
+            event_filter=coordinator.async_filter_entity_registry_updated,
+        )
+    )
 
     return True
 
@@ -200,6 +222,12 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(config_entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(config_entry.entry_id)
+        await entry_data["coordinator"].api.close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the persisted state of a deleted entry."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{config_entry.entry_id}").async_remove()
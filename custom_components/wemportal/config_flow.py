@@ -15,15 +15,23 @@ from homeassistant import exceptions
 from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
 from homeassistant.core import callback, HomeAssistant
 import homeassistant.helpers.config_validation as config_validation
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from .wemportalapi import WemPortalApi
 from .const import (
     DOMAIN,
     CONF_LANGUAGE,
     CONF_MODE,
     CONF_SCAN_INTERVAL_API,
+    CONF_SCAN_INTERVAL_FAST,
+    CONF_SCAN_INTERVAL_SLOW,
+    CONF_FAST_PARAMETERS,
+    CONF_SLOW_PARAMETERS,
+    CONF_WEB_TABS,
     DEFAULT_MODE,
     AVAILABLE_MODES,
-    DEFAULT_CONF_LANGUAGE_VALUE
+    DEFAULT_CONF_LANGUAGE_VALUE,
+    DEFAULT_CONF_SCAN_INTERVAL_SLOW_VALUE,
+    DEFAULT_WEB_TAB,
 )
 from .exceptions import AuthError
 
@@ -42,12 +50,13 @@ DATA_SCHEMA = vol.Schema(
 async def validate_input(hass: HomeAssistant, data):
     """Validate the user input allows us to connect."""
     # Create API object for authentication check
-    api = WemPortalApi(data[CONF_USERNAME], data[CONF_PASSWORD])
+    session = async_create_clientsession(hass, auto_cleanup=False)
+    api = WemPortalApi(data[CONF_USERNAME], data[CONF_PASSWORD], session=session)
 
     try:
         if data[CONF_MODE] in ("api", "both"):
             try:
-                await hass.async_add_executor_job(api.api_login)
+                await api.api_login()
             except AuthError:
                 _LOGGER.warning("Mobile API login failed, trying web login...")
                 await hass.async_add_executor_job(api.web_login)
@@ -57,6 +66,8 @@ async def validate_input(hass: HomeAssistant, data):
         raise InvalidAuth from exc
     except Exception as exc:
         raise CannotConnect from exc
+    finally:
+        session.detach()
 
     return data
 
@@ -134,6 +145,27 @@ class WemportalOptionsFlow(OptionsFlow):
                             CONF_SCAN_INTERVAL_API, 300
                         ),
                     ): config_validation.positive_int,
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL_FAST,
+                        default=self.config_entry.options.get(
+                            CONF_SCAN_INTERVAL_FAST,
+                            self.config_entry.options.get(CONF_SCAN_INTERVAL_API, 300),
+                        ),
+                    ): config_validation.positive_int,
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL_SLOW,
+                        default=self.config_entry.options.get(
+                            CONF_SCAN_INTERVAL_SLOW, DEFAULT_CONF_SCAN_INTERVAL_SLOW_VALUE
+                        ),
+                    ): config_validation.positive_int,
+                    vol.Optional(
+                        CONF_FAST_PARAMETERS,
+                        default=self.config_entry.options.get(CONF_FAST_PARAMETERS, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_SLOW_PARAMETERS,
+                        default=self.config_entry.options.get(CONF_SLOW_PARAMETERS, ""),
+                    ): str,
                     vol.Optional(
                         CONF_LANGUAGE,
                         default=self.config_entry.options.get(CONF_LANGUAGE, "en"),
@@ -142,6 +174,10 @@ class WemportalOptionsFlow(OptionsFlow):
                     vol.Optional(
                         CONF_MODE, default=self.config_entry.options.get(CONF_MODE, DEFAULT_MODE)
                         ): vol.In(AVAILABLE_MODES),
+                    vol.Optional(
+                        CONF_WEB_TABS,
+                        default=self.config_entry.options.get(CONF_WEB_TABS, DEFAULT_WEB_TAB),
+                    ): str,
                 }
             ),
         )
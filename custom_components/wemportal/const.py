@@ -17,9 +17,26 @@ DEFAULT_NAME: Final = "Weishaupt WEM Portal"
 DEFAULT_TIMEOUT: Final = 360
 WEB_MAIN_URL: Final = "https://www.wemportal.com/Web/Default.aspx"
 WEB_LOGIN_URL: Final = "https://www.wemportal.com/Web/Login.aspx"
+# Index of every tab of the web portal submenu
+WEB_TABS: Final = {
+    "overview": 0,
+    "system": 1,
+    "user": 2,
+    "expert": 3,
+    "statistics": 4,
+    "data_loggers": 5,
+}
+DEFAULT_WEB_TAB: Final = "expert"
+# Bytes of a streamed web page handed to the parser in the executor at once
+WEB_FEED_SIZE: Final = 64 * 1024
 CONF_SCAN_INTERVAL_API: Final = "api_scan_interval"
+CONF_SCAN_INTERVAL_FAST: Final = "fast_scan_interval"
+CONF_SCAN_INTERVAL_SLOW: Final = "slow_scan_interval"
+CONF_FAST_PARAMETERS: Final = "fast_parameters"
+CONF_SLOW_PARAMETERS: Final = "slow_parameters"
 CONF_LANGUAGE: Final = "language"
 CONF_MODE: Final = "mode"
+CONF_WEB_TABS: Final = "web_tabs"
 DEFAULT_MODE: Final = "api"
 AVAILABLE_MODES: Final = ["api", "web", "both"]
 PLATFORMS = ["number", "select", "sensor", "switch"]
@@ -27,6 +44,7 @@ REFRESH_WAIT_TIME: Final = 360
 DATA_GATHERING_ERROR: Final = "An error occurred while gathering data.This issue should resolve by itself. If this problem persists,open an issue at https://github.com/erikkastelec/hass-WEM-Portal/issues"
 DEFAULT_CONF_SCAN_INTERVAL_API_VALUE: Final = 300
 DEFAULT_CONF_SCAN_INTERVAL_VALUE: Final = 1800
+DEFAULT_CONF_SCAN_INTERVAL_SLOW_VALUE: Final = 3600
 DEFAULT_CONF_LANGUAGE_VALUE: Final = "en"
 DEFAULT_CONF_MODE_VALUE: Final = "api"
 API_LOGIN_URL: Final = "https://www.wemportal.com/app/Account/Login"
@@ -40,6 +58,62 @@ API_CIRCUIT_TIMES_REFRESH_URL: Final = "https://www.wemportal.com/app/CircuitTim
 API_CIRCUIT_TIMES_READ_URL: Final = "https://www.wemportal.com/app/CircuitTimes/Read"
 API_STATISTICS_REFRESH_URL: Final = "https://www.wemportal.com/app/Statistics/Refresh"
 API_STATISTICS_READ_URL: Final = "https://www.wemportal.com/app/Statistics/Read"
+# Token bucket settings per endpoint class: (refill rate in requests/s, burst size).
+# The "global" bucket applies to every call and bounds the total request rate.
+API_RATE_LIMITS: Final = {
+    "global": (1.0, 3),
+    "auth": (1 / 60, 2),
+    "metadata": (0.5, 3),
+    "data": (1.0, 3),
+    "write": (1.0, 5),
+    "schedule": (0.5, 4),
+    "statistics": (0.5, 3),
+}
+# Request priorities in the token buckets, lower is served first
+PRIORITY_WRITE: Final = 0
+PRIORITY_POLL: Final = 1
+# AIMD backoff of the global rate on 403/WAF responses
+API_BACKOFF_MIN_RATE: Final = 1 / 60
+API_BACKOFF_INCREASE: Final = 0.02
+API_BACKOFF_HISTORY: Final = 20
+# Recovery stops this fraction below the learned limit...
+API_BACKOFF_HEADROOM: Final = 0.8
+# ...and the limit is forgotten gradually over this many seconds after the last 403
+API_BACKOFF_LIMIT_TTL: Final = 24 * 3600
+# 403s within this many seconds of a decrease belong to the same episode (request timeout)
+API_BACKOFF_COOLDOWN: Final = 10
+# Persistent state of the integration (helpers.storage.Store)
+STORAGE_VERSION: Final = 1
+STORAGE_KEY: Final = DOMAIN
+STORAGE_SAVE_DELAY: Final = 10
+# Age in seconds after which the cached device/parameter catalog is revalidated
+CATALOG_CACHE_TTL: Final = 7 * 24 * 3600
+# Maximum number of concurrent EventType/Read calls during parameter discovery
+PARAMETER_DISCOVERY_CONCURRENCY: Final = 4
+# Poll tiers of API parameters
+POLL_TIER_FAST: Final = "fast"
+POLL_TIER_NORMAL: Final = "normal"
+POLL_TIER_SLOW: Final = "slow"
+# Seconds a fetched heating schedule (CircuitTimes) is reused
+SCHEDULE_CACHE_TTL: Final = 24 * 3600
+# Seconds between starting the CircuitTimes jobs and the first read, and reads per job
+SCHEDULE_JOB_DELAY: Final = 2
+SCHEDULE_JOB_READS: Final = 3
+# Seconds a statistics group's energy values are reused before they are read again
+STATISTICS_INTERVAL: Final = 3600
+# Seconds writes to a device are collected before they are sent as one request
+WRITE_COALESCE_DELAY: Final = 0.3
+# Seconds after a write until the written parameters are read back
+WRITE_READ_BACK_DELAY: Final = 3
+# Translated names kept by translations.translate
+TRANSLATION_CACHE_SIZE: Final = 4096
+# DataAccess/Refresh completion probing (seconds)
+REFRESH_DEFAULT_LATENCY: Final = 5.0
+REFRESH_MIN_PROBE: Final = 0.5
+REFRESH_MAX_PROBES: Final = 3
+# Every Nth refresh of a device is first read at a fraction of the expected latency
+REFRESH_EXPLORE_INTERVAL: Final = 5
+REFRESH_EXPLORE_FRACTION: Final = 0.5
 
 # Scraper Constants
 MISSING_DATA_STRINGS: Final = ["--", "label ist null", "label ist null "]
@@ -2,19 +2,30 @@
 from __future__ import annotations
 from time import monotonic
 import copy
+import hashlib
+import json
 
 import async_timeout
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from .exceptions import ForbiddenError, ServerError, WemPortalError, AuthError
-from .const import _LOGGER, DEFAULT_CONF_SCAN_INTERVAL_API_VALUE, DEFAULT_TIMEOUT, DOMAIN
+from .const import (
+    _LOGGER,
+    DEFAULT_CONF_SCAN_INTERVAL_API_VALUE,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    STORAGE_SAVE_DELAY,
+)
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from .statistics import async_import_statistics
 from .wemportalapi import WemPortalApi
 
 class WemPortalDataUpdateCoordinator(DataUpdateCoordinator):
@@ -26,6 +37,7 @@ class WemPortalDataUpdateCoordinator(DataUpdateCoordinator):
         api: WemPortalApi,
         config_entry: ConfigEntry,
         update_interval,
+        store: Store | None = None,
     ) -> None:
         """Initialize DataUpdateCoordinator for the wemportal component"""
         super().__init__(
@@ -39,7 +51,127 @@ class WemPortalDataUpdateCoordinator(DataUpdateCoordinator):
         self.config_entry = config_entry
         self.last_try = None
         self.num_failed = 0
+        # Persists what the API learned (rate limits, ...) across restarts
+        self.store = store
+        # Digest of the last saved state, unchanged state is not written again
+        self._saved_state_digest = None
+        self.api.on_read_back = self.async_handle_read_back
+        # (device_id, data key) pairs changed by the last update, None updates every entity
+        self.changed_keys: set | None = None
+        # Listeners per context, entities use (device_id, data key) as context
+        self._context_listeners: dict = {}
+        self._published_success = None
+        # Entity ids of this config entry, as of the last async_update_disabled_keys
+        self._entity_ids: set = set()
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        """Listen for data updates, indexed by context."""
+        remove = super().async_add_listener(update_callback, context)
+        self._context_listeners.setdefault(context, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            self._context_listeners[context].remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of changed data keys only.
+
+        Every listener is updated when the changed keys are unknown or the
+        availability changed.
+        """
+        if self.changed_keys is None or self._published_success != self.last_update_success:
+            self._published_success = self.last_update_success
+            super().async_update_listeners()
+            return
+        for context in self.changed_keys:
+            for update_callback in list(self._context_listeners.get(context, ())):
+                update_callback()
+
+    @callback
+    def async_handle_read_back(self, changed_keys: dict) -> None:
+        """Publish values the API read back after a write."""
+        self.changed_keys = {
+            (device_id, key) for device_id, keys in changed_keys.items() for key in keys
+        }
+        self.async_update_listeners()
+
+    async def async_load_state(self) -> None:
+        """Restore the persisted API state."""
+        if self.store is None:
+            return
+        self.api.restore_state(await self.store.async_load() or {})
+        self._saved_state_digest = self._state_digest(self.api.export_state())
+
+    @callback
+    def async_update_disabled_keys(self) -> None:
+        """Tell the API which data keys only back disabled entities."""
+        if self.config_entry is None:
+            return
+        registry = er.async_get(self.hass)
+        disabled = {}
+        enabled = set()
+        entries = er.async_entries_for_config_entry(registry, self.config_entry.entry_id)
+        self._entity_ids = {entry.entity_id for entry in entries}
+        for entry in entries:
+            # unique_id is "<entry_id>:<device_id>:<data key>"
+            parts = entry.unique_id.split(":", 2)
+            if len(parts) != 3:
+                continue
+            _, device_id, data_key = parts
+            if entry.disabled_by is None:
+                enabled.add((device_id, data_key))
+            else:
+                disabled.setdefault(device_id, set()).add(data_key)
+        for device_id, data_key in enabled:
+            disabled.get(device_id, set()).discard(data_key)
+        _LOGGER.debug(
+            "Skipping parameters of disabled entities: %s",
+            {device_id: len(keys) for device_id, keys in disabled.items()},
+        )
+        self.api.disabled_keys = disabled
+
+    @callback
+    def async_filter_entity_registry_updated(self, event: Event | dict) -> bool:
+        """Only pass registry events of entities of this config entry."""
+        # Home Assistant 2024.4 passes the event data instead of the event
+        data = event.data if isinstance(event, Event) else event
+        if data["entity_id"] in self._entity_ids:
+            return True
+        entry = er.async_get(self.hass).async_get(data["entity_id"])
+        return (
+            entry is not None
+            and self.config_entry is not None
+            and entry.config_entry_id == self.config_entry.entry_id
+        )
+
+    @callback
+    def async_handle_entity_registry_updated(self, event: Event) -> None:
+        """Recompute the polled parameters when entities are enabled or disabled."""
+        if event.data["action"] == "update" and "disabled_by" not in event.data.get("changes", {}):
+            return
+        self.async_update_disabled_keys()
+
+    @staticmethod
+    def _state_digest(state: dict) -> str:
+        """Return a digest of an exported API state."""
+        return hashlib.sha1(
+            json.dumps(state, sort_keys=True, default=str).encode()
+        ).hexdigest()
 
+    def _async_save_state(self) -> None:
+        """Schedule saving the API state if it changed since the last save."""
+        if self.store is None:
+            return
+        digest = self._state_digest(self.api.export_state())
+        if digest == self._saved_state_digest:
+            return
+        self._saved_state_digest = digest
+        self.store.async_delay_save(self.api.export_state, STORAGE_SAVE_DELAY)
 
     async def _async_update_data(self):
         """Fetch data from the wemportal api"""
@@ -57,23 +189,44 @@ class WemPortalDataUpdateCoordinator(DataUpdateCoordinator):
 
         async with async_timeout.timeout(DEFAULT_TIMEOUT):
             try:
-                x = await self.hass.async_add_executor_job(self.api.fetch_data, enabled_devices)
+                x = await self.api.fetch_data(enabled_devices)
                 self.num_failed = 0
+                await async_import_statistics(self.hass, self.api)
+                # Entities are only written when their data changed
+                self.changed_keys = {
+                    (device_id, key)
+                    for device_id, keys in self.api.changed_keys.items()
+                    for key in keys
+                }
+                self.always_update = bool(self.changed_keys)
                 return x
             except AuthError as exc:
+                self.changed_keys = None
                 self.num_failed += 1
                 _LOGGER.error("Authentication error, raising ConfigEntryAuthFailed: %s", exc)
                 raise ConfigEntryAuthFailed("WEM Portal authentication failed. Check your credentials.") from exc
             except (WemPortalError, ForbiddenError) as exc:
+                self.changed_keys = None
                 self.num_failed += 1
                 if self.num_failed >= 2:
                     _LOGGER.info("API errors persistent. Re-instantiating WemPortalApi to recover from potentially corrupted session/state.")
+                    old_api = self.api
                     self.api = WemPortalApi(
                         self.config_entry.data.get(CONF_USERNAME),
                         self.config_entry.data.get(CONF_PASSWORD),
                         config=self.config_entry.options,
-                        existing_data=self.api.data
+                        existing_data=self.api.data,
+                        session=self.api.session,
+                        scheduler=self.api.scheduler,
                     )
+                    # Keep the cached catalog so recovery does not rediscover everything
+                    self.api.restore_state(old_api.export_state())
+                    self.api.disabled_keys = old_api.disabled_keys
+                    self.api.on_read_back = self.async_handle_read_back
+                    # The session and scheduler are shared with the new API
+                    await old_api.cancel_tasks()
+                    await old_api.close_scraper()
                 raise UpdateFailed(f"Error fetching data from wemportal: {exc}") from exc
             finally:
                 self.last_try = monotonic()
+                self._async_save_state()
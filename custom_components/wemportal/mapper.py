@@ -1,8 +1,16 @@
 """Data mapper for mapping API values to Home Assistant platforms."""
 
+from __future__ import annotations
+
+import re
 from collections import defaultdict
+from typing import NamedTuple
+
 from .translations import friendly_name_mapper, translate
-from .const import WemDataType
+from .const import POLL_TIER_FAST, POLL_TIER_NORMAL, POLL_TIER_SLOW, WemDataType
+
+# Units of fast changing measurements (temperatures, modulation, power, flow)
+FAST_POLL_UNITS = {"°c", "k", "%", "w", "kw", "hz", "m3/h", "rpm", "1/min"}
 
 
 def sanitize_value(value_str):
@@ -36,6 +44,168 @@ def get_min_max(param_id: str, data_type: int, min_val, max_val) -> tuple[float,
     return 0.0, 100.0
 
 
+def get_poll_tier(parameter: dict, unit, overrides: dict) -> str:
+    """Return the poll tier of an API parameter.
+
+    User overrides (ParameterID -> tier) win. Writeable parameters (setpoints,
+    party/holiday settings, modes), enums and schedules rarely change and are
+    polled slowly, measurements with a fast changing unit are polled fast.
+    """
+    param_id = parameter["ParameterID"]
+    if param_id.casefold() in overrides:
+        return overrides[param_id.casefold()]
+    if (
+        parameter.get("IsWriteable")
+        or parameter.get("EnumValues")
+        or parameter.get("DataType") == WemDataType.PROGRAM
+    ):
+        return POLL_TIER_SLOW
+    if unit and unit.strip().lower() in FAST_POLL_UNITS:
+        return POLL_TIER_FAST
+    return POLL_TIER_NORMAL
+
+
+_NON_TOKEN_RE = re.compile(r'[^a-zA-Z0-9äöüß]')
+
+
+def tokenize(text: str) -> set[str]:
+    """Return the lower case words of a name."""
+    return set(_NON_TOKEN_RE.sub(' ', text.lower()).split())
+
+
+class ScrapedTokenIndex:
+    """Inverted index from name tokens to the scraped entities of a device.
+
+    A scraped entity matches an API sensor when all tokens of its translated
+    name occur in the sensor's name. Lookups only touch the entities that
+    share a token with the sensor.
+    """
+
+    def __init__(self, device_data: dict, language: str) -> None:
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._entities: list[tuple[str, int]] = []
+        for scraped_data in device_data.values():
+            if not isinstance(scraped_data, dict):
+                continue
+            scraped_entity_id = scraped_data.get("ParameterID", "")
+            parts = scraped_entity_id.split("-")
+            if len(parts) < 2:
+                continue
+            words = tokenize(translate(language, friendly_name_mapper(parts[1])))
+            if not words:
+                continue
+            position = len(self._entities)
+            self._entities.append((scraped_entity_id, len(words)))
+            for word in words:
+                self._postings[word].append(position)
+
+    def match(self, name: str) -> list[str]:
+        """Return the scraped entity ids whose name tokens all occur in ``name``."""
+        hits: dict[int, int] = defaultdict(int)
+        for word in tokenize(name):
+            for position in self._postings.get(word, ()):
+                hits[position] += 1
+        return [
+            self._entities[position][0]
+            for position in sorted(hits)
+            if hits[position] == self._entities[position][1]
+        ]
+
+
+class ParameterPlan(NamedTuple):
+    """Static mapping of one API parameter, compiled from its EventType metadata."""
+
+    key: str
+    friendly_name: str
+    is_writeable: bool
+    data_type: int | None
+    has_enum: bool
+    # "number", "select" or "switch" for writeable parameters, None maps to a sensor
+    platform: str | None
+    min_value: float | None = None
+    max_value: float | None = None
+    step: float | None = None
+    options: tuple = ()
+    options_names: tuple = ()
+
+
+# Icon per unit, every other unit gets "mdi:flash"
+UNIT_ICONS = {"°C": "mdi:thermometer"}
+
+
+def compile_parameter_plan(module: dict, parameter: dict, language: str) -> ParameterPlan:
+    """Compile the mapping plan of a single parameter."""
+    param_id = parameter["ParameterID"]
+    translated_name = translate(language, friendly_name_mapper(param_id))
+    translated_module_name = translate(language, module["Name"].strip())
+
+    module_words = set(translated_module_name.lower().split())
+    entity_words = set(translated_name.lower().split())
+
+    if module_words.issubset(entity_words):
+        friendly_name = translated_name
+    else:
+        friendly_name = f"{translated_module_name} {translated_name}"
+
+    is_writeable = parameter.get("IsWriteable", False)
+    data_type = parameter.get("DataType")
+    plan = ParameterPlan(
+        key=f"{module['Name']}-{param_id}",
+        friendly_name=friendly_name,
+        is_writeable=is_writeable,
+        data_type=data_type,
+        has_enum=bool(parameter.get("EnumValues")),
+        platform=None,
+    )
+    if not is_writeable:
+        return plan
+
+    min_val, max_val = get_min_max(
+        param_id,
+        data_type,
+        parameter.get("MinValue"),
+        parameter.get("MaxValue")
+    )
+
+    if data_type in (WemDataType.NUMBER_STEP_HALF, WemDataType.NUMBER_STEP_ONE):
+        return plan._replace(
+            platform="number",
+            min_value=min_val,
+            max_value=max_val,
+            step=0.5 if data_type == WemDataType.NUMBER_STEP_HALF else 1,
+        )
+    if data_type == WemDataType.SELECT:
+        return plan._replace(
+            platform="select",
+            options=tuple(x["Value"] for x in parameter.get("EnumValues", [])),
+            options_names=tuple(x["Name"] for x in parameter.get("EnumValues", [])),
+        )
+    if data_type == WemDataType.SWITCH:
+        if int(min_val) == 0 and int(max_val) == 1:
+            return plan._replace(platform="switch")
+        return plan._replace(
+            platform="number",
+            min_value=min_val,
+            max_value=max_val,
+            step=1,
+        )
+    return plan
+
+
+def compile_mapping_plan(device_modules: dict, language: str) -> dict:
+    """Compile the mapping plans of a device's parameters.
+
+    Returns {(ModuleIndex, ModuleType): {ParameterID: ParameterPlan}}.
+    """
+    return {
+        module_tuple: {
+            param_id: compile_parameter_plan(module, parameter, language)
+            for param_id, parameter in module.get("parameters", {}).items()
+        }
+        for module_tuple, module in device_modules.items()
+    }
+
+
 class WemPortalDataMapper:
     """Handles mapping of raw API and Scraped data into Home Assistant platforms."""
 
@@ -48,117 +218,96 @@ class WemPortalDataMapper:
         scraping_mapper: dict,
         mode: str,
         api_data: dict,
+        mapping_plan: dict | None = None,
+        changed_keys: set | None = None,
+        scraped_index: ScrapedTokenIndex | None = None,
+        scraping_unmatched: set | None = None,
     ):
-        """Processes the read values JSON and maps it to api_data."""
+        """Processes the read values JSON and maps it to api_data.
+
+        mapping_plan is the result of compile_mapping_plan for the device. It
+        is compiled here when not given. The keys of entities whose data
+        changed are added to changed_keys. In "both" mode, scraped_index is
+        the device's ScrapedTokenIndex. It is built here when a sensor still
+        needs matching and no index is given. ParameterIDs without a scraped
+        match are mapped to their own entity and added to scraping_unmatched.
+        """
+        if changed_keys is None:
+            changed_keys = set()
+        device_data = api_data[device_id]
+
+        def assign(key, entity):
+            if device_data.get(key) != entity:
+                device_data[key] = entity
+                changed_keys.add(key)
+
         icon_mapper = defaultdict(lambda: "mdi:flash")
-        icon_mapper["°C"] = "mdi:thermometer"
+        icon_mapper.update(UNIT_ICONS)
+
+        if mapping_plan is None:
+            mapping_plan = compile_mapping_plan(modules_dict[device_id], language)
 
         parsed_sensors = {}
 
         for module in values_json.get("Modules", []):
-            module_tuple = (module["ModuleIndex"], module["ModuleType"])
-            if module_tuple not in modules_dict[device_id]:
+            module_plan = mapping_plan.get((module["ModuleIndex"], module["ModuleType"]))
+            if module_plan is None:
                 continue
 
-            device_module = modules_dict[device_id][module_tuple]
-
             for value in module.get("Values", []):
-                param_id = value["ParameterID"]
-                if param_id not in device_module["parameters"]:
+                plan = module_plan.get(value["ParameterID"])
+                if plan is None:
                     continue
 
-                parameter = device_module["parameters"][param_id]
-                name = f"{device_module['Name']}-{parameter['ParameterID']}"
-
                 numeric_val = value.get("NumericValue")
                 string_val = value.get("StringValue", "")
 
                 final_value = numeric_val if numeric_val is not None else string_val
 
-                if parameter.get("EnumValues"):
+                if plan.has_enum:
                     final_value = sanitize_value(string_val)
-                else:
-                    if isinstance(final_value, str):
-                        final_value = sanitize_value(final_value)
-
-                is_writeable = parameter.get("IsWriteable", False)
-                data_type = parameter.get("DataType")
-
-                translated_name = translate(
-                    language,
-                    friendly_name_mapper(param_id),
-                )
-                translated_module_name = translate(language, device_module['Name'].strip())
-                
-                module_words = set(translated_module_name.lower().split())
-                entity_words = set(translated_name.lower().split())
-                
-                if module_words.issubset(entity_words):
-                    friendly_name = translated_name
-                else:
-                    friendly_name = f"{translated_module_name} {translated_name}"
+                elif isinstance(final_value, str):
+                    final_value = sanitize_value(final_value)
 
-                parsed_sensors[name] = {
-                    "friendlyName": friendly_name,
-                    "ParameterID": param_id,
-                    "unit": value.get("Unit"),
+                unit = value.get("Unit")
+                parsed_sensors[plan.key] = {
+                    "friendlyName": plan.friendly_name,
+                    "ParameterID": value["ParameterID"],
+                    "unit": unit,
                     "value": final_value,
-                    "IsWriteable": is_writeable,
-                    "DataType": data_type,
+                    "IsWriteable": plan.is_writeable,
+                    "DataType": plan.data_type,
                     "ModuleIndex": module["ModuleIndex"],
                     "ModuleType": module["ModuleType"],
                 }
 
-                if is_writeable:
-                    common_attrs = {
-                        "friendlyName": parsed_sensors[name]["friendlyName"],
-                        "ParameterID": param_id,
-                        "unit": value.get("Unit"),
-                        "icon": icon_mapper[value.get("Unit")],
-                        "value": final_value,
-                        "DataType": data_type,
-                        "ModuleIndex": module["ModuleIndex"],
-                        "ModuleType": module["ModuleType"],
-                    }
-
-                    min_val, max_val = get_min_max(
-                        param_id, 
-                        data_type, 
-                        parameter.get("MinValue"), 
-                        parameter.get("MaxValue")
-                    )
-
-                    if data_type in (WemDataType.NUMBER_STEP_HALF, WemDataType.NUMBER_STEP_ONE):
-                        api_data[device_id][name] = {
-                            **common_attrs,
-                            "platform": "number",
-                            "min_value": min_val,
-                            "max_value": max_val,
-                            "step": 0.5 if data_type == WemDataType.NUMBER_STEP_HALF else 1,
-                        }
-                    elif data_type == WemDataType.SELECT:
-                        api_data[device_id][name] = {
-                            **common_attrs,
-                            "platform": "select",
-                            "options": [x["Value"] for x in parameter.get("EnumValues", [])],
-                            "optionsNames": [x["Name"] for x in parameter.get("EnumValues", [])],
-                        }
-                    elif data_type == WemDataType.SWITCH:
-                        if isinstance(final_value, str) and final_value.startswith("{"):
-                            pass  # It's a JSON schedule, fallback to sensor
-                        elif int(min_val) == 0 and int(max_val) == 1:
-                            api_data[device_id][name] = {
-                                **common_attrs,
-                                "platform": "switch",
-                            }
-                        else:
-                            api_data[device_id][name] = {
-                                **common_attrs,
-                                "platform": "number",
-                                "min_value": min_val,
-                                "max_value": max_val,
-                                "step": 1,
-                            }
+                if plan.platform is None or (
+                    plan.data_type == WemDataType.SWITCH
+                    and isinstance(final_value, str)
+                    and final_value.startswith("{")
+                ):
+                    # Read-only, unknown writeable datatype or a JSON schedule: sensor
+                    continue
+
+                entity = {
+                    "friendlyName": plan.friendly_name,
+                    "ParameterID": value["ParameterID"],
+                    "unit": unit,
+                    "icon": icon_mapper[unit],
+                    "value": final_value,
+                    "DataType": plan.data_type,
+                    "ModuleIndex": module["ModuleIndex"],
+                    "ModuleType": module["ModuleType"],
+                    "platform": plan.platform,
+                }
+                if plan.platform == "number":
+                    entity["min_value"] = plan.min_value
+                    entity["max_value"] = plan.max_value
+                    entity["step"] = plan.step
+                elif plan.platform == "select":
+                    entity["options"] = list(plan.options)
+                    entity["optionsNames"] = list(plan.options_names)
+                assign(plan.key, entity)
 
         # Process read-only sensors and fallback for unknown writeable datatypes
         for key, sensor in parsed_sensors.items():
@@ -166,28 +315,15 @@ class WemPortalDataMapper:
                 if mode == "both" and len(api_data.keys()) < 2:
                     param_id = sensor["ParameterID"]
                     if param_id not in scraping_mapper:
-                        for scraped_entity, scraped_data in api_data[device_id].items():
-                            if not isinstance(scraped_data, dict):
-                                continue
-                            scraped_entity_id = scraped_data.get("ParameterID", "")
-                            try:
-                                import re
-                                scraped_part = scraped_entity_id.split("-")[1]
-                                translated_scraped = translate(language, friendly_name_mapper(scraped_part))
-                                
-                                def tokenize(text):
-                                    return set(re.sub(r'[^a-zA-Z0-9äöüß]', ' ', text.lower()).split())
-                                    
-                                sensor_words = tokenize(sensor["friendlyName"])
-                                scraped_words = tokenize(translated_scraped)
-                                
-                                if scraped_words and scraped_words.issubset(sensor_words):
-                                    scraping_mapper.setdefault(param_id, []).append(scraped_entity_id)
-                            except IndexError:
-                                pass
-
-                        if param_id not in scraping_mapper:
+                        if scraped_index is None:
+                            scraped_index = ScrapedTokenIndex(api_data[device_id], language)
+                        matches = scraped_index.match(sensor["friendlyName"])
+                        if matches:
+                            scraping_mapper[param_id] = matches
+                        else:
                             scraping_mapper[param_id] = [key]
+                            if scraping_unmatched is not None:
+                                scraping_unmatched.add(param_id)
 
                     for scraped_entity in scraping_mapper[param_id]:
                         sensor_dict = {
@@ -199,20 +335,17 @@ class WemPortalDataMapper:
                             "ParameterID": scraped_entity,
                             "platform": "sensor",
                         }
-                        if scraped_entity in api_data[device_id]:
-                            api_data[device_id][scraped_entity].update(sensor_dict)
-                        else:
-                            api_data[device_id][scraped_entity] = sensor_dict
+                        assign(scraped_entity, {**api_data[device_id].get(scraped_entity, {}), **sensor_dict})
                 else:
                     new_unit = sensor.get("unit")
                     old_unit = api_data[device_id].get(key, {}).get("unit")
                     final_unit = new_unit if new_unit is not None else old_unit
                     
-                    api_data[device_id][key] = {
+                    assign(key, {
                         "value": sensor["value"],
                         "ParameterID": sensor["ParameterID"],
                         "unit": final_unit,
                         "icon": icon_mapper.get(final_unit, "mdi:flash"),
                         "friendlyName": sensor["friendlyName"],
                         "platform": "sensor",
-                    }
+                    })
@@ -69,7 +69,8 @@ class WemPortalNumber(CoordinatorEntity, NumberEntity):
         self, coordinator, config_entry: ConfigEntry, device_id, _unique_id, entity_data
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # Only updated when the coordinator reports this data key as changed
+        super().__init__(coordinator, context=(device_id, _unique_id))
 
         val, uom = fix_value_and_uom(entity_data["value"], entity_data["unit"])
 
@@ -102,8 +103,7 @@ class WemPortalNumber(CoordinatorEntity, NumberEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.change_value,
+        await self.coordinator.api.change_value(
             self._device_id,
             self._parameter_id,
             self._module_index,
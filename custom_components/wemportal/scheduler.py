@@ -0,0 +1,263 @@
+"""Request scheduling for the WEM Portal mobile API."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from time import monotonic
+
+from .const import (
+    _LOGGER,
+    API_CIRCUIT_TIMES_READ_URL,
+    API_CIRCUIT_TIMES_REFRESH_URL,
+    API_DATA_ACCESS_READ_URL,
+    API_DATA_ACCESS_WRITE_URL,
+    API_DEVICE_READ_URL,
+    API_DEVICE_STATUS_READ_URL,
+    API_EVENT_TYPE_READ_URL,
+    API_LOGIN_URL,
+    API_BACKOFF_COOLDOWN,
+    API_BACKOFF_HEADROOM,
+    API_BACKOFF_HISTORY,
+    API_BACKOFF_INCREASE,
+    API_BACKOFF_LIMIT_TTL,
+    API_BACKOFF_MIN_RATE,
+    API_RATE_LIMITS,
+    API_REFRESH_URL,
+    API_STATISTICS_READ_URL,
+    API_STATISTICS_REFRESH_URL,
+    PRIORITY_POLL,
+    PRIORITY_WRITE,
+    REFRESH_DEFAULT_LATENCY,
+    REFRESH_EXPLORE_FRACTION,
+    REFRESH_EXPLORE_INTERVAL,
+    REFRESH_MIN_PROBE,
+)
+
+# Endpoint class of every known API url. Unknown urls only use the global bucket.
+ENDPOINT_CLASSES = {
+    API_LOGIN_URL: "auth",
+    API_DEVICE_READ_URL: "metadata",
+    API_EVENT_TYPE_READ_URL: "metadata",
+    API_DEVICE_STATUS_READ_URL: "data",
+    API_REFRESH_URL: "data",
+    API_DATA_ACCESS_READ_URL: "data",
+    API_DATA_ACCESS_WRITE_URL: "write",
+    API_CIRCUIT_TIMES_REFRESH_URL: "schedule",
+    API_CIRCUIT_TIMES_READ_URL: "schedule",
+    API_STATISTICS_REFRESH_URL: "statistics",
+    API_STATISTICS_READ_URL: "statistics",
+}
+
+# Endpoint classes whose requests jump ahead of queued polling requests
+PRIORITY_CLASSES = {"write": PRIORITY_WRITE}
+
+
+class TokenBucket:
+    """Asyncio token bucket.
+
+    Holds up to ``burst`` tokens and refills ``rate`` tokens per second, so
+    over any window of T seconds at most ``burst + rate * T`` acquisitions
+    succeed. Waiters are served by priority (lowest first), then in FIFO order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping the tokens earned so far."""
+        self._refill()
+        self.rate = rate
+
+    def drain(self) -> None:
+        """Drop all stored tokens so no burst follows."""
+        self._refill()
+        self._tokens = 0.0
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        """Wait until a token is available and take it."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self) -> None:
+        """Hand out tokens to the waiters as they are refilled."""
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Waiter was cancelled
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+
+class AdaptiveBackoff:
+    """AIMD controller for the refill rate of a token bucket.
+
+    Every 403 or WAF response halves the rate and remembers the rate that
+    triggered it. Every successful call adds a small step back, up to a
+    ceiling a margin below the remembered limit. The ceiling moves back up to
+    the configured rate as the last limit ages, ten times slower above the
+    remembered limit.
+    """
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        min_rate: float = API_BACKOFF_MIN_RATE,
+        increase: float = API_BACKOFF_INCREASE,
+    ) -> None:
+        self.bucket = bucket
+        self.max_rate = bucket.rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.limit_rate: float | None = None
+        self.limited_at: list[float] = []
+
+    def ceiling(self) -> float:
+        """Return the highest rate the additive increase may reach."""
+        if self.limit_rate is None or not self.limited_at:
+            return self.max_rate
+        age = time.time() - self.limited_at[-1]
+        if age >= API_BACKOFF_LIMIT_TTL:
+            return self.max_rate
+        cap = min(self.max_rate, self.limit_rate * API_BACKOFF_HEADROOM)
+        return cap + (self.max_rate - cap) * age / API_BACKOFF_LIMIT_TTL
+
+    def record_success(self) -> None:
+        """Additive increase after a successful call."""
+        ceiling = self.ceiling()
+        if self.bucket.rate >= ceiling:
+            return
+        step = self.increase
+        if self.limit_rate is not None and self.bucket.rate >= self.limit_rate:
+            step /= 10
+        self.bucket.set_rate(min(ceiling, self.bucket.rate + step))
+
+    def record_limited(self, sent_at: float | None = None) -> None:
+        """Multiplicative decrease after a 403 or WAF response.
+
+        Concurrent requests of one burst are limited together and only count
+        once. Responses to requests sent before the last decrease, or within
+        API_BACKOFF_COOLDOWN of it, are part of that episode.
+        """
+        now = time.time()
+        if self.limited_at:
+            last = self.limited_at[-1]
+            if now - last < API_BACKOFF_COOLDOWN or (sent_at is not None and sent_at < last):
+                return
+        self.limit_rate = self.bucket.rate
+        self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+        self.bucket.drain()
+        self.limited_at = [*self.limited_at, now][-API_BACKOFF_HISTORY:]
+        _LOGGER.info(
+            "Rate limited by WEM Portal at %.3f requests/s. Backing off to %.3f requests/s.",
+            self.limit_rate,
+            self.bucket.rate,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the learned state for persisting."""
+        return {
+            "rate": self.bucket.rate,
+            "limit_rate": self.limit_rate,
+            "limited_at": self.limited_at,
+        }
+
+    def restore(self, data: dict) -> None:
+        """Restore the state returned by as_dict."""
+        if not data:
+            return
+        rate = data.get("rate", self.max_rate)
+        self.bucket.set_rate(min(self.max_rate, max(self.min_rate, rate)))
+        self.limit_rate = data.get("limit_rate")
+        self.limited_at = list(data.get("limited_at", []))[-API_BACKOFF_HISTORY:]
+
+
+class RequestScheduler:
+    """Routes every API call through a per-endpoint-class and a global token bucket."""
+
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None) -> None:
+        if limits is None:
+            limits = API_RATE_LIMITS
+        self.buckets = {
+            endpoint_class: TokenBucket(rate, burst)
+            for endpoint_class, (rate, burst) in limits.items()
+        }
+        # Learns the sustainable overall rate from the portal's rate-limit responses
+        self.backoff = AdaptiveBackoff(self.buckets["global"])
+
+    async def acquire(self, url: str) -> None:
+        """Wait until a request to ``url`` may be sent.
+
+        Writes are served before queued polling requests of the same bucket.
+        """
+        endpoint_class = ENDPOINT_CLASSES.get(url)
+        priority = PRIORITY_CLASSES.get(endpoint_class, PRIORITY_POLL)
+        if endpoint_class in self.buckets:
+            await self.buckets[endpoint_class].acquire(priority)
+        await self.buckets["global"].acquire(priority)
+
+
+class RefreshLatencyTracker:
+    """Learns how long a DataAccess/Refresh takes per device.
+
+    Keeps an exponentially weighted moving average of the observed latency,
+    so the first read after a refresh lands close to the typical completion
+    time. Later probes back off exponentially. Every explore_every-th refresh
+    starts with an early probe, so a shorter latency can be observed.
+    """
+
+    def __init__(
+        self, alpha: float = 0.3, explore_every: int = REFRESH_EXPLORE_INTERVAL
+    ) -> None:
+        self.alpha = alpha
+        self.explore_every = explore_every
+        self.latency: dict[str, float] = {}
+        self.refreshes: dict[str, int] = {}
+
+    def expected(self, device_id: str) -> float:
+        """Return the expected refresh latency of a device."""
+        return self.latency.get(device_id, REFRESH_DEFAULT_LATENCY)
+
+    def probe_delays(self, device_id: str, probes: int) -> list[float]:
+        """Return the waits before each read probe."""
+        expected = self.expected(device_id)
+        first = max(REFRESH_MIN_PROBE, expected)
+        step = max(REFRESH_MIN_PROBE, expected / 4)
+        delays = [first] + [step * 2**i for i in range(probes - 1)]
+        self.refreshes[device_id] = self.refreshes.get(device_id, 0) + 1
+        early = max(REFRESH_MIN_PROBE, expected * REFRESH_EXPLORE_FRACTION)
+        if self.refreshes[device_id] % self.explore_every == 0 and early < first:
+            delays[0] = first - early
+            delays.insert(0, early)
+        return delays
+
+    def record(self, device_id: str, seconds: float) -> None:
+        """Record an observed refresh latency."""
+        if device_id not in self.latency:
+            self.latency[device_id] = seconds
+        else:
+            self.latency[device_id] += self.alpha * (seconds - self.latency[device_id])
@@ -1,14 +1,18 @@
 """Web scraping scraper for WEM Portal using curl_cffi."""
 
-import time
+import asyncio
+import json
+import re
 import logging
-from collections import defaultdict
 from curl_cffi import requests
-from lxml import html
+from lxml import etree
 from custom_components.wemportal.exceptions import AuthError, ExpiredSessionError
 from custom_components.wemportal.const import (
+    DEFAULT_WEB_TAB,
+    WEB_FEED_SIZE,
     WEB_LOGIN_URL,
     WEB_MAIN_URL,
+    WEB_TABS,
     MISSING_DATA_STRINGS,
     BOOLEAN_OFF_STRINGS,
     BOOLEAN_ON_STRINGS,
@@ -19,171 +23,393 @@ from custom_components.wemportal.const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# ASP.NET hidden form fields posted back with every tab selection
+_FORM_FIELDS = ("__EVENTVALIDATION", "__VIEWSTATE", "__ECNPAGEVIEWSTATE")
+# Class of the Expert page panels holding the simpleData tables
+_PANEL_CLASS = "RadPanelBar RadPanelBar_Default rpbSimpleData"
+
+# XPath expressions of the Expert page, compiled once
+_PANELS = etree.XPath(f'descendant-or-self::div[contains(@class, "{_PANEL_CLASS}")]')
+_PANEL_HEADER = etree.XPath('.//th[contains(@class, "simpleDataHeaderTextCell")]/span/text()')
+_PANEL_ROWS = etree.XPath(
+    './/div[contains(@class, "rpTemplate")]/table[contains(@class, "simpleDataTable")]/tbody/tr'
+)
+_ROW_NAME = etree.XPath('.//td[contains(@class, "simpleDataNameCell")]/span/text()')
+_ROW_VALUE = etree.XPath(
+    './/td[contains(@class, "simpleDataValueCell") or contains(@class, "simpleDataValueEnumCell")]/span/text()'
+)
+
+
+def _keyword_re(keywords):
+    """Return a regex matching names that contain any of the keywords."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+_TEMPERATURE_RE = _keyword_re(TEMPERATURE_KEYWORDS)
+_PERCENTAGE_RE = _keyword_re(PERCENTAGE_KEYWORDS)
+_ENERGY_POWER_RE = _keyword_re(ENERGY_POWER_KEYWORDS)
+_MISSING_DATA = frozenset(MISSING_DATA_STRINGS)
+_BOOLEAN_OFF = frozenset(BOOLEAN_OFF_STRINGS)
+_BOOLEAN_ON = frozenset(BOOLEAN_ON_STRINGS)
+
+# ClientState of the main dock and (text, value) of the submenu items, in WEB_TABS order
+_MAIN_CLIENT_STATE = '{"Top":0,"Left":0,"DockZoneID":"ctl00_RDZParent","Collapsed":false,"Pinned":false,"Resizable":false,"Closed":false,"Width":"99%","Height":null,"ExpandedHeight":0,"Index":0,"IsDragged":false}'
+_SUBMENU_ITEMS = [
+    ("Overview", "110"),
+    ("System:+dom", ""),
+    ("User", "222"),
+    ("Expert", "223"),
+    ("Statistics", "225"),
+    ("Data+Loggers", "224"),
+]
+
+
+def _submenu_client_state(index):
+    """Return the submenu ClientState with the item at ``index`` selected."""
+    entries = [{"Type": 3}]
+    for item_index, (text, value) in enumerate(_SUBMENU_ITEMS):
+        data = {"text": text, "value": value}
+        if item_index == index:
+            data["selected"] = True
+        entries.append({"Type": 1, "Index": str(item_index), "Data": data})
+    state = {"logEntries": entries, "selectedItemIndex": str(index)}
+    return json.dumps(state, separators=(",", ":")) + " "
+
+
+def _parse_panel(div, output):
+    """Add the rows of an Expert page panel to ``output``."""
+    header_elems = _PANEL_HEADER(div)
+    if not header_elems:
+        return
+    header_raw = header_elems[0].strip()
+    header = (
+        header_elems[0].replace("/#", "")
+        .replace("  ", "")
+        .replace(" - ", "_")
+        .replace("/*+/*", "_")
+        .replace(" ", "_")
+        .casefold()
+    )
+
+    for td in _PANEL_ROWS(div):
+        try:
+            name_elems = _ROW_NAME(td)
+            val_elems = _ROW_VALUE(td)
+
+            if name_elems and val_elems:
+                raw_name = name_elems[0].strip()
+                friendly_name = f"{header_raw} - {raw_name.lstrip('- ')}"
+
+                name = name_elems[0].replace("  ", "").replace(" ", "_").casefold()
+                name = header + "-" + name
+                name_lower = name.lower()
+                original_value = val_elems[0].strip()
+                value = original_value
+
+                split_value = value.split(" ", 1)
+                unit = ""
+                if len(split_value) >= 2:
+                    value = split_value[0]
+                    unit = split_value[1]
+                else:
+                    value = split_value[0]
+
+                try:
+                    value = ".".join(value.split(","))
+                    value = float(value)
+                except ValueError:
+                    # If it's not a number, revert to the full string
+                    value = original_value
+                    unit = None
+
+                if not unit:
+                    if _TEMPERATURE_RE.search(name_lower):
+                        unit = '°C'
+                    elif _PERCENTAGE_RE.search(name_lower):
+                        unit = '%'
+
+                # Handle missing or boolean values
+                value_lower = value.lower() if isinstance(value, str) else value
+                if value_lower in _MISSING_DATA:
+                    # Energy/Power sensors MUST be None to avoid Energy Dashboard spikes.
+                    if _ENERGY_POWER_RE.search(name_lower):
+                        value = None
+                    else:
+                        value = 0.0
+                elif value_lower in _BOOLEAN_OFF:
+                    value = 0.0
+                elif value_lower in _BOOLEAN_ON:
+                    value = 1.0
+
+                output[name] = {
+                    "value": value,
+                    "name": name,
+                    "icon": "mdi:thermometer" if unit == "°C" else "mdi:flash",
+                    "unit": unit,
+                    "platform": "sensor",
+                    "friendlyName": friendly_name,
+                    "ParameterID": name,
+                }
+        except (IndexError, ValueError):
+            continue
+
+
+class ExpertPageParser:
+    """Incremental parser of WEM Portal pages.
+
+    Fed with the response body chunk by chunk, it keeps only the ASP.NET
+    hidden form fields and the values of the simpleData panels. Every panel
+    is parsed and freed as soon as it is complete, and every other element
+    as soon as it ends, so the full tree of the page never exists at once.
+    """
+
+    def __init__(self, encoding=None):
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self._panel_depth = 0
+        self.fields = {}
+        self.output = {}
+
+    @property
+    def form_state(self):
+        """Return the hidden form fields of the page, or None if missing."""
+        if "__VIEWSTATE" not in self.fields or "__EVENTVALIDATION" not in self.fields:
+            return None
+        return {field: self.fields.get(field, "") for field in _FORM_FIELDS}
+
+    def feed(self, data):
+        """Parse the next chunk of the page."""
+        self._parser.feed(data)
+        self._read_events()
+
+    def close(self):
+        """Parse the rest of the page and drop the parser."""
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            # Empty body, e.g. of an error response
+            pass
+        self._read_events()
+        self._parser = None
+        return self
+
+    def _read_events(self):
+        for event, element in self._parser.read_events():
+            is_panel = element.tag == "div" and _PANEL_CLASS in (element.get("class") or "")
+            if event == "start":
+                self._panel_depth += is_panel
+                continue
+            field = element.get("id")
+            if field in _FORM_FIELDS and element.get("value") is not None:
+                self.fields.setdefault(field, element.get("value"))
+            if is_panel:
+                self._panel_depth -= 1
+                if self._panel_depth == 0:
+                    for div in _PANELS(element):
+                        _parse_panel(div, self.output)
+            if self._panel_depth == 0:
+                self._free(element)
+
+    @staticmethod
+    def _free(element):
+        """Drop an element that has ended, together with its earlier siblings."""
+        element.clear(keep_tail=False)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
 class WemPortalScraper:
     """Scraper for navigating and extracting data from WEM Portal using curl_cffi."""
 
-    def __init__(self, username, password, cookie=None):
+    def __init__(self, username, password, cookie=None, tabs=(DEFAULT_WEB_TAB,)):
         self.username = username
         self.password = password
         self.cookie = cookie if cookie else {}
-        self.session = requests.Session(impersonate="chrome110")
-        
-    def scrape(self):
-        """Perform the scraping process and return the extracted data."""
+        # Tabs of the submenu to scrape; values of earlier tabs win on equal keys
+        self.tabs = sorted(set(tabs), key=lambda tab: (tab != DEFAULT_WEB_TAB, WEB_TABS[tab]))
+        self.session = requests.AsyncSession(impersonate="chrome110")
+        # Reuse the session of the last run, so the login can be skipped
+        self.session.cookies.update(self.cookie)
+        # Hidden form fields of the last accepted tab response
+        self.form_state = None
+
+    async def close(self):
+        """Close the curl_cffi session."""
+        await self.session.close()
+
+    @staticmethod
+    def _is_login_page(response):
+        """Return True if the response was redirected to the login page."""
+        url = response.url.lower()
+        return "AspxAutoDetectCookieSupport".lower() in url or WEB_LOGIN_URL.lower() in url
+
+    async def scrape(self):
+        """Perform the scraping process and return the extracted data.
+
+        The tabs are first requested with the cookies and form state of the
+        previous run. The full login only happens when the portal redirects
+        to the login page.
+        """
+        if dict(self.session.cookies):
+            try:
+                return self._merge_tabs(await self.select_tabs())
+            except ExpiredSessionError:
+                _LOGGER.debug("Web scraping session expired, logging in again")
+                self.session.cookies.clear()
+
+        await self.login()
+        try:
+            return self._merge_tabs(await self.select_tabs())
+        except ExpiredSessionError as exc:
+            raise AuthError(f"Authentication Error: Session rejected right after login. {exc}") from exc
+
+    async def login(self):
+        """Log in to the portal, storing the session cookies in the session."""
         # 1. GET Login page
         try:
-            r1 = self.session.get(WEB_LOGIN_URL)
+            r1 = await self.session.get(WEB_LOGIN_URL, stream=True)
+            login_page = await self._read_page(r1)
             if r1.status_code != 200:
                 raise AuthError(f"Authentication Error: Received {r1.status_code} on login page.")
         except Exception as e:
             raise AuthError(f"Authentication Error: {e}")
 
-        tree = html.fromstring(r1.text)
-        viewstate_elem = tree.xpath("//*[@id='__VIEWSTATE']/@value")
-        eventval_elem = tree.xpath("//*[@id='__EVENTVALIDATION']/@value")
-        
-        if not viewstate_elem or not eventval_elem:
+        fields = login_page.fields
+        if "__VIEWSTATE" not in fields or "__EVENTVALIDATION" not in fields:
             raise AuthError("Authentication Error: Could not find VIEWSTATE or EVENTVALIDATION.")
-            
-        viewstate = viewstate_elem[0]
-        eventval = eventval_elem[0]
 
         # 2. POST Login
         login_data = {
-            "__VIEWSTATE": viewstate,
-            "__EVENTVALIDATION": eventval,
+            "__VIEWSTATE": fields["__VIEWSTATE"],
+            "__EVENTVALIDATION": fields["__EVENTVALIDATION"],
             "ctl00$content$tbxUserName": self.username,
             "ctl00$content$tbxPassword": self.password,
             "ctl00$content$btnLogin": "Anmelden",
         }
         
-        r2 = self.session.post(WEB_LOGIN_URL, data=login_data, allow_redirects=True)
+        r2 = await self.session.post(WEB_LOGIN_URL, data=login_data, allow_redirects=True, stream=True)
+        # Only the status and url matter, the page is dropped while it arrives
+        await self._read_page(r2)
         if r2.status_code != 200:
             raise AuthError(f"Authentication Error: Encountered error after login. Received {r2.status_code}.")
 
         # Check if we were redirected back to login with an error (like AspxAutoDetectCookieSupport)
-        if "AspxAutoDetectCookieSupport" in r2.url or WEB_LOGIN_URL.lower() in r2.url.lower():
+        if self._is_login_page(r2):
             raise AuthError(f"Authentication Error: Login failed or cookies not detected. URL: {r2.url}")
 
         # Wait a moment
-        time.sleep(2)
-        
+        await asyncio.sleep(2)
+
+    async def select_tabs(self):
+        """Return the parsed page of every tab.
+
+        Posts against the form state of the previous response, so Default.aspx
+        only has to be downloaded when there is no cached state or the portal
+        rejects it. Raises ExpiredSessionError if the portal redirects to the
+        login page.
+        """
+        pages = {}
+        missing = self.tabs
+        if self.form_state:
+            pages = await self._post_tabs(self.form_state, self.tabs)
+            missing = [tab for tab in self.tabs if pages[tab] is None]
+            if not missing:
+                return pages
+            _LOGGER.debug("Cached ViewState was rejected, reloading the main page")
+            self.form_state = None
+
         # 3. GET Default.aspx
-        r_main = self.session.get(WEB_MAIN_URL)
-        tree_main = html.fromstring(r_main.text)
-        
-        viewstate_main_elem = tree_main.xpath("//*[@id='__VIEWSTATE']/@value")
-        eventval_main_elem = tree_main.xpath("//*[@id='__EVENTVALIDATION']/@value")
-        pageview_main_elem = tree_main.xpath("//*[@id='__ECNPAGEVIEWSTATE']/@value")
-        
-        if not viewstate_main_elem or not eventval_main_elem:
+        r_main = await self.session.get(WEB_MAIN_URL, stream=True)
+        if self._is_login_page(r_main):
+            await r_main.aclose()
+            raise ExpiredSessionError(f"Redirected to login page. URL: {r_main.url}")
+        form_state = (await self._read_page(r_main)).form_state
+        if form_state is None:
             raise AuthError("Scraping Error: Could not find VIEWSTATE on main page.")
 
+        # 4. POST to select the tabs
+        pages.update(await self._post_tabs(form_state, missing, fresh=True))
+        return pages
+
+    async def _post_tabs(self, form_state, tabs, fresh=False):
+        """Select every tab concurrently, each on its own copy of the form state.
+
+        Returns the parsed page per tab, or None for the tabs whose posted
+        state was rejected. Pages of a fresh state are returned even without
+        form state of their own.
+        """
+        responses = await asyncio.gather(
+            *(self._post_tab(dict(form_state), tab) for tab in tabs)
+        )
+        pages = {}
+        for tab, (status_code, page) in zip(tabs, responses):
+            if status_code == 200 and page.form_state is not None:
+                # Keep the form state for the next scrape
+                self.form_state = page.form_state
+            elif not fresh:
+                page = None
+            pages[tab] = page
+        return pages
+
+    async def _post_tab(self, form_state, tab):
+        """Post the selection of a submenu tab against the given form state.
+
+        Returns the status code and the parsed page.
+        """
         form_data = {
-            "__EVENTVALIDATION": eventval_main_elem[0],
-            "__VIEWSTATE": viewstate_main_elem[0],
-            "__ECNPAGEVIEWSTATE": pageview_main_elem[0] if pageview_main_elem else "",
+            **form_state,
             "__EVENTTARGET": "ctl00$SubMenuControl1$subMenu",
-            "__EVENTARGUMENT": "3",
-            "ctl00_rdMain_ClientState": '{"Top":0,"Left":0,"DockZoneID":"ctl00_RDZParent","Collapsed":false,"Pinned":false,"Resizable":false,"Closed":false,"Width":"99%","Height":null,"ExpandedHeight":0,"Index":0,"IsDragged":false}',
-            "ctl00_SubMenuControl1_subMenu_ClientState": '{"logEntries":[{"Type":3},{"Type":1,"Index":"0","Data":{"text":"Overview","value":"110"}},{"Type":1,"Index":"1","Data":{"text":"System:+dom","value":""}},{"Type":1,"Index":"2","Data":{"text":"User","value":"222"}},{"Type":1,"Index":"3","Data":{"text":"Expert","value":"223","selected":true}},{"Type":1,"Index":"4","Data":{"text":"Statistics","value":"225"}},{"Type":1,"Index":"5","Data":{"text":"Data+Loggers","value":"224"}}],"selectedItemIndex":"3"} ',
+            "__EVENTARGUMENT": str(WEB_TABS[tab]),
+            "ctl00_rdMain_ClientState": _MAIN_CLIENT_STATE,
+            "ctl00_SubMenuControl1_subMenu_ClientState": _submenu_client_state(WEB_TABS[tab]),
         }
+        response = await self.session.post(
+            WEB_MAIN_URL, data=form_data, allow_redirects=True, stream=True
+        )
+        if self._is_login_page(response):
+            await response.aclose()
+            self.form_state = None
+            raise ExpiredSessionError(f"Redirected to login page. URL: {response.url}")
+        return response.status_code, await self._read_page(response)
 
-        # 4. POST to select 'Expert' tab
-        r_expert = self.session.post(WEB_MAIN_URL, data=form_data, allow_redirects=True)
-        
-        # 5. Extract data
-        return self.parse_expert_page(r_expert.text)
+    @staticmethod
+    async def _read_page(response):
+        """Stream a response body into an ExpertPageParser.
 
-    def parse_expert_page(self, html_content):
-        _LOGGER.debug("Parsing expert page HTML")
+        The body is parsed in the executor, in batches of about WEB_FEED_SIZE
+        bytes, so large ViewState pages do not block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        parser = ExpertPageParser(response.charset_encoding or "utf-8")
+        batch = []
+        size = 0
+        async for chunk in response.aiter_content():
+            batch.append(chunk)
+            size += len(chunk)
+            if size >= WEB_FEED_SIZE:
+                await loop.run_in_executor(None, parser.feed, b"".join(batch))
+                batch = []
+                size = 0
+        if batch:
+            await loop.run_in_executor(None, parser.feed, b"".join(batch))
+        return await loop.run_in_executor(None, parser.close)
+
+    def _merge_tabs(self, pages):
+        """Merge the values of all tabs into one output dict."""
         output = {}
-        tree = html.fromstring(html_content)
-        
-        for div in tree.xpath('//div[contains(@class, "RadPanelBar RadPanelBar_Default rpbSimpleData")]'):
-            header_elems = div.xpath('.//th[contains(@class, "simpleDataHeaderTextCell")]/span/text()')
-            if header_elems:
-                header_raw = header_elems[0].strip()
-                header = (
-                    header_elems[0].replace("/#", "")
-                    .replace("  ", "")
-                    .replace(" - ", "_")
-                    .replace("/*+/*", "_")
-                    .replace(" ", "_")
-                    .casefold()
-                )
-            else:
-                header_raw = "Unknown"
-                header = "unknown"
-                continue
-                
-            for td in div.xpath('.//div[contains(@class, "rpTemplate")]/table[contains(@class, "simpleDataTable")]/tbody/tr'):
-                try:
-                    name_elems = td.xpath('.//td[contains(@class, "simpleDataNameCell")]/span/text()')
-                    val_elems = td.xpath('.//td[contains(@class, "simpleDataValueCell") or contains(@class, "simpleDataValueEnumCell")]/span/text()')
-                    
-                    if name_elems and val_elems:
-                        raw_name = name_elems[0].strip()
-                        friendly_name = f"{header_raw} - {raw_name.lstrip('- ')}"
-                        
-                        name = name_elems[0].replace("  ", "").replace(" ", "_").casefold()
-                        name = header + "-" + name
-                        original_value = val_elems[0].strip()
-                        value = original_value
-                        
-                        split_value = value.split(" ", 1)
-                        unit = ""
-                        if len(split_value) >= 2:
-                            value = split_value[0]
-                            unit = split_value[1]
-                        else:
-                            value = split_value[0]
-                            
-                        try:
-                            value = ".".join(value.split(","))
-                            value = float(value)
-                        except ValueError:
-                            # If it's not a number, revert to the full string
-                            value = original_value
-                            unit = None
-
-                        if not unit:
-                            name_lower = name.lower()
-                            if any(x in name_lower for x in TEMPERATURE_KEYWORDS):
-                                unit = '°C'
-                            elif any(x in name_lower for x in PERCENTAGE_KEYWORDS):
-                                unit = '%'
-
-                        # Handle missing or boolean values
-                        value_lower = str(value).lower() if isinstance(value, str) else value
-                        if value_lower in MISSING_DATA_STRINGS:
-                            # Energy/Power sensors MUST be None to avoid Energy Dashboard spikes.
-                            name_lower = name.lower()
-                            if any(x in name_lower for x in ENERGY_POWER_KEYWORDS):
-                                value = None
-                            else:
-                                value = 0.0
-                        elif value_lower in BOOLEAN_OFF_STRINGS:
-                            value = 0.0
-                        elif value_lower in BOOLEAN_ON_STRINGS:
-                            value = 1.0
-
-                        icon_mapper = defaultdict(lambda: "mdi:flash")
-                        icon_mapper["°C"] = "mdi:thermometer"
-
-                        output[name] = {
-                            "value": value,
-                            "name": name,
-                            "icon": icon_mapper[unit],
-                            "unit": unit,
-                            "platform": "sensor",
-                            "friendlyName": friendly_name,
-                            "ParameterID": name,
-                        }
-                except (IndexError, ValueError):
-                    continue
+        for tab in self.tabs:
+            for key, value in pages[tab].output.items():
+                output.setdefault(key, value)
+        # Save cookies for next run (extracted from requests Session)
+        output["cookie"] = dict(self.session.cookies)
+        return [output]
 
+    def parse_expert_page(self, html_content):
+        _LOGGER.debug("Parsing expert page HTML")
+        parser = ExpertPageParser()
+        parser.feed(html_content)
+        output = parser.close().output
         # Save cookies for next run (extracted from requests Session)
-        cookies_dict = dict(self.session.cookies)
-        output["cookie"] = cookies_dict
+        output["cookie"] = dict(self.session.cookies)
         return [output]
@@ -44,7 +44,8 @@ class WemPortalSelect(CoordinatorEntity, SelectEntity):
         self, coordinator, config_entry: ConfigEntry, device_id, _unique_id, entity_data
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # Only updated when the coordinator reports this data key as changed
+        super().__init__(coordinator, context=(device_id, _unique_id))
         self._last_updated = None
         self._config_entry = config_entry
         self._device_id = device_id
@@ -86,8 +87,7 @@ class WemPortalSelect(CoordinatorEntity, SelectEntity):
 
     async def async_select_option(self, option: str) -> None:
         """Call the API to change the parameter value"""
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.change_value,
+        await self.coordinator.api.change_value(
             self._device_id,
             self._parameter_id,
             self._module_index,
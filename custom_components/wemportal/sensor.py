@@ -73,7 +73,8 @@ class WemPortalSensor(CoordinatorEntity, SensorEntity):
         self, coordinator, config_entry: ConfigEntry, device_id, _unique_id, entity_data
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # Only updated when the coordinator reports this data key as changed
+        super().__init__(coordinator, context=(device_id, _unique_id))
 
         val, uom = fix_value_and_uom(entity_data["value"], entity_data["unit"])
 
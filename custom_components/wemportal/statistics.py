@@ -0,0 +1,76 @@
+"""Long-term statistics import of the WEM Portal energy series."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import _LOGGER, DOMAIN
+from .wemportalapi import WemPortalApi
+
+
+def statistic_id(device_id: str, group_id) -> str:
+    """Return the external statistic id of an energy group."""
+    return f"{DOMAIN}:{device_id}_energy_{group_id}".lower()
+
+
+def daily_points(values: list, today: datetime) -> list[tuple[datetime, float]]:
+    """Return (day start, value) of the completed days of a Statistics/Read series.
+
+    The last value of the series is the current day, which is still counting
+    and therefore left out.
+    """
+    points = []
+    for index, value in enumerate(values[:-1]):
+        start = None
+        if value.get("Date"):
+            start = dt_util.parse_datetime(str(value["Date"]))
+            if start is not None:
+                start = dt_util.start_of_local_day(dt_util.as_local(start))
+        if start is None:
+            start = dt_util.start_of_local_day(today.date() - timedelta(days=len(values) - 1 - index))
+        points.append((start, float(value.get("Value") or 0.0)))
+    return points
+
+
+def new_statistics(series: dict, mark: dict | None, today: datetime) -> tuple[list[dict], dict | None]:
+    """Return the statistic rows newer than the high-water mark and the new mark."""
+    last_start = mark["start"] if mark else None
+    total = mark["sum"] if mark else 0.0
+    rows = []
+    for start, value in daily_points(series["values"], today):
+        if last_start is not None and start.timestamp() <= last_start:
+            continue
+        total += value
+        rows.append({"start": start, "state": value, "sum": total})
+        last_start = start.timestamp()
+    if not rows:
+        return rows, mark
+    return rows, {"start": last_start, "sum": total}
+
+
+async def async_import_statistics(hass: HomeAssistant, api: WemPortalApi) -> None:
+    """Import the energy series fetched by the API into long-term statistics."""
+    if not api.statistics or "recorder" not in hass.config.components:
+        return
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    today = dt_util.start_of_local_day()
+    for key, series in api.statistics.items():
+        rows, mark = new_statistics(series, api.statistics_marks.get(key), today)
+        if not rows:
+            continue
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=series["name"],
+            source=DOMAIN,
+            statistic_id=statistic_id(series["device_id"], series["group_id"]),
+            unit_of_measurement=series["unit"],
+        )
+        _LOGGER.debug("Importing %s statistics rows for %s", len(rows), metadata["statistic_id"])
+        async_add_external_statistics(hass, metadata, [StatisticData(**row) for row in rows])
+        api.statistics_marks[key] = mark
+    api.statistics = {}
@@ -49,7 +49,8 @@ class WemPortalSwitch(CoordinatorEntity, SwitchEntity):
         entity_data,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # Only updated when the coordinator reports this data key as changed
+        super().__init__(coordinator, context=(device_id, _unique_id))
 
         val, uom = fix_value_and_uom(entity_data["value"], entity_data["unit"])
 
@@ -87,8 +88,7 @@ class WemPortalSwitch(CoordinatorEntity, SwitchEntity):
         }
 
     async def async_turn_on(self, **kwargs) -> None:
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.change_value,
+        await self.coordinator.api.change_value(
             self._device_id,
             self._parameter_id,
             self._module_index,
@@ -99,8 +99,7 @@ class WemPortalSwitch(CoordinatorEntity, SwitchEntity):
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs) -> None:
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.change_value,
+        await self.coordinator.api.change_value(
             self._device_id,
             self._parameter_id,
             self._module_index,
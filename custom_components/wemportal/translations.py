@@ -1,4 +1,9 @@
 """Translations for WEM Portal."""
+import re
+from functools import lru_cache
+
+from .const import TRANSLATION_CACHE_SIZE
+
 
 def friendly_name_mapper(value: str) -> str:
     friendly_name_dict = {
@@ -29,100 +34,139 @@ def friendly_name_mapper(value: str) -> str:
     return out
 
 
-def translate(language: str, value: str) -> str:
-    value = value.lower()
-    
-    # Safe word fragments and full words, sorted by length later to match longest first
-    vocab = {
-        "en": {
-            "betriebsart": "operating mode",
-            "wärmeerzeuger": "heat generator",
-            "heizkreis": "heating circuit",
-            "warmwasser": "hot water",
-            "außentemperatur": "outside temperature",
-            "aussentemperatur": "outside temperature",
-            "raumtemperatur": "room temperature",
-            "vorlauftemperatur": "flow temperature",
-            "warmwassertemperatur": "hot water temperature",
-            "kollektortemperatur": "collector temperature",
-            "anlagendruck": "system pressure",
-            "wärmeleistung": "heat output",
-            "raumsolltemperatur": "room setpoint temperature",
-            "warmwassersolltemperatur": "hot water setpoint temperature",
-            "temperatur": "temperature",
-            "vorlauf": "flow",
-            "rücklauf": "return",
-            "raum": "room",
-            "außen": "outside",
-            "aussen": "outside",
-            "anlage": "system",
-            "kollektor": "collector",
-            "betriebs": "operating",
-            "wärme": "heat",
-            "1_wez": "1st heat generator",
-            "1.wez": "1st heat generator",
-            "2_wez": "2nd heat generator",
-            "2.wez": "2nd heat generator",
-            "wez": "heat generator",
-            "erzeuger": "generator",
-            "druck": "pressure",
-            "leistung": "output",
-            "soll": "setpoint",
-            "absenk": "reduced",
-            "normal": "normal",
-            "komfort": "comfort",
-            "party": "party",
-            "urlaub": "holiday",
-            "funktion": "function",
-            "beginn": "begin",
-            "ende": "end",
-            "push": "push",
-            "programm": "program",
-            "program": "program",
-            "gesamt": "total",
-            "energie": "energy",
-            "el.": "electrical",
-            "kühlen": "cooling",
-            "heizen": "heating",
-            "kühl": "cooling",
-            "heiz": "heating",
-            "wasser": "water",
-            "consuption": "consumption",
-            "compresso": "compressor",
-            "mont": "month",
-            "months": "month",
-            "switching_e2": "switchings e2",
-            "oat": "outside air temperature",
-            "ctt": "compressor discharge temperature",
-            "ict": "indoor coil temperature",
-            "irt": "indoor return temperature",
-            "omt": "outdoor middle temperature",
-            "lwt": "leaving water temperature",
-            "odu": "outdoor unit",
-            "wwp sg": "wwp sg",
-            "wwp em hk": "wwp em hk",
-            "r130": "r130",
-        }
+# Safe word fragments and full words per language, replaced longest first
+_VOCAB = {
+    "en": {
+        "betriebsart": "operating mode",
+        "wärmeerzeuger": "heat generator",
+        "heizkreis": "heating circuit",
+        "warmwasser": "hot water",
+        "außentemperatur": "outside temperature",
+        "aussentemperatur": "outside temperature",
+        "raumtemperatur": "room temperature",
+        "vorlauftemperatur": "flow temperature",
+        "warmwassertemperatur": "hot water temperature",
+        "kollektortemperatur": "collector temperature",
+        "anlagendruck": "system pressure",
+        "wärmeleistung": "heat output",
+        "raumsolltemperatur": "room setpoint temperature",
+        "warmwassersolltemperatur": "hot water setpoint temperature",
+        "temperatur": "temperature",
+        "vorlauf": "flow",
+        "rücklauf": "return",
+        "raum": "room",
+        "außen": "outside",
+        "aussen": "outside",
+        "anlage": "system",
+        "kollektor": "collector",
+        "betriebs": "operating",
+        "wärme": "heat",
+        "1_wez": "1st heat generator",
+        "1.wez": "1st heat generator",
+        "2_wez": "2nd heat generator",
+        "2.wez": "2nd heat generator",
+        "wez": "heat generator",
+        "erzeuger": "generator",
+        "druck": "pressure",
+        "leistung": "output",
+        "soll": "setpoint",
+        "absenk": "reduced",
+        "normal": "normal",
+        "komfort": "comfort",
+        "party": "party",
+        "urlaub": "holiday",
+        "funktion": "function",
+        "beginn": "begin",
+        "ende": "end",
+        "push": "push",
+        "programm": "program",
+        "program": "program",
+        "gesamt": "total",
+        "energie": "energy",
+        "el.": "electrical",
+        "kühlen": "cooling",
+        "heizen": "heating",
+        "kühl": "cooling",
+        "heiz": "heating",
+        "wasser": "water",
+        "consuption": "consumption",
+        "compresso": "compressor",
+        "mont": "month",
+        "months": "month",
+        "switching_e2": "switchings e2",
+        "oat": "outside air temperature",
+        "ctt": "compressor discharge temperature",
+        "ict": "indoor coil temperature",
+        "irt": "indoor return temperature",
+        "omt": "outdoor middle temperature",
+        "lwt": "leaving water temperature",
+        "odu": "outdoor unit",
+        "wwp sg": "wwp sg",
+        "wwp em hk": "wwp em hk",
+        "r130": "r130",
     }
-    
-    out = value
-    
-    if language in vocab:
+}
+
+
+class _WordFinder:
+    """Finds every vocabulary word occurring in a text with one regex scan.
+
+    The regex reports the longest word starting at each position. Every
+    shorter word starting there is contained in it, so the words contained
+    in each match are precomputed.
+    """
+
+    def __init__(self, words: list[str]) -> None:
+        # Alternatives are tried in order, so ``words`` must be sorted longest first
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(word) for word in words) + "))")
+        self._contained = {
+            word: frozenset(index for index, other in enumerate(words) if other in word)
+            for word in words
+        }
+
+    def find(self, text: str) -> set[int]:
+        """Return the indexes of all words occurring in ``text``."""
+        found = set()
+        for match in self._pattern.finditer(text):
+            found |= self._contained[match.group(1)]
+        return found
+
+
+class _Translator:
+    """Translator for one language, compiled once from its vocabulary."""
+
+    def __init__(self, vocab: dict[str, str]) -> None:
         # Sort replacements by length descending so longer compound words match first
-        replacements = sorted(vocab[language].items(), key=lambda x: len(x[0]), reverse=True)
-        
-        # Use placeholders to prevent cascading translation bugs
+        self._replacements = sorted(vocab.items(), key=lambda x: len(x[0]), reverse=True)
+        self._finder = _WordFinder([de_word for de_word, _ in self._replacements])
+
+    def __call__(self, out: str) -> str:
+        # Only the words found in the text can be replaced, in the original order
         placeholders = {}
-        for i, (de_word, en_word) in enumerate(replacements):
+        for i in sorted(self._finder.find(out)):
+            de_word, en_word = self._replacements[i]
+            # Use placeholders to prevent cascading translation bugs
             if de_word in out:
                 placeholder = f"__TOKEN_{i}__"
                 placeholders[placeholder] = f" {en_word} "
                 out = out.replace(de_word, placeholder)
-                
+
         # Resolve placeholders back to English words
         for placeholder, en_word in placeholders.items():
             out = out.replace(placeholder, en_word)
-                
+        return out
+
+
+_TRANSLATORS = {language: _Translator(vocab) for language, vocab in _VOCAB.items()}
+
+
+@lru_cache(maxsize=TRANSLATION_CACHE_SIZE)
+def translate(language: str, value: str) -> str:
+    out = value.lower()
+
+    if language in _TRANSLATORS:
+        out = _TRANSLATORS[language](out)
+
     out = out.replace("_", " ")
     # Clean up extra spaces caused by multiple replacements
     out = " ".join(out.split()).title()
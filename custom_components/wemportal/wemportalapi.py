@@ -3,10 +3,14 @@ Weishaupt webscraping and API library
 """
 
 
+import asyncio
 import copy
+import hashlib
+import json
 import time
 from datetime import datetime, timedelta
 
+import aiohttp
 from bs4 import BeautifulSoup
 import requests as reqs
 from homeassistant.const import CONF_SCAN_INTERVAL
@@ -20,6 +24,7 @@ from .exceptions import (
     ServerError,
 )
 
+from .scheduler import RefreshLatencyTracker, RequestScheduler
 from .const import (
     _LOGGER,
     API_DATA_ACCESS_READ_URL,
@@ -33,21 +38,49 @@ from .const import (
     API_CIRCUIT_TIMES_READ_URL,
     API_STATISTICS_REFRESH_URL,
     API_STATISTICS_READ_URL,
+    CATALOG_CACHE_TTL,
     CONF_LANGUAGE,
     CONF_MODE,
+    CONF_FAST_PARAMETERS,
     CONF_SCAN_INTERVAL_API,
+    CONF_SCAN_INTERVAL_FAST,
+    CONF_SCAN_INTERVAL_SLOW,
+    CONF_SLOW_PARAMETERS,
+    CONF_WEB_TABS,
     DATA_GATHERING_ERROR,
     DEFAULT_CONF_LANGUAGE_VALUE,
     DEFAULT_CONF_MODE_VALUE,
     DEFAULT_CONF_SCAN_INTERVAL_API_VALUE,
+    DEFAULT_CONF_SCAN_INTERVAL_SLOW_VALUE,
     DEFAULT_CONF_SCAN_INTERVAL_VALUE,
+    DEFAULT_WEB_TAB,
+    PARAMETER_DISCOVERY_CONCURRENCY,
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
+    REFRESH_MAX_PROBES,
+    SCHEDULE_CACHE_TTL,
+    SCHEDULE_JOB_DELAY,
+    SCHEDULE_JOB_READS,
+    STATISTICS_INTERVAL,
+    WEB_TABS,
+    WRITE_COALESCE_DELAY,
+    WRITE_READ_BACK_DELAY,
 )
 
 
 class WemPortalApi:
     """Wrapper class for Weishaupt WEM Portal"""
 
-    def __init__(self, username, password, config=None, existing_data=None) -> None:
+    def __init__(
+        self,
+        username,
+        password,
+        config=None,
+        existing_data=None,
+        session=None,
+        scheduler=None,
+    ) -> None:
         if config is None:
             config = {}
         self.data = copy.deepcopy(existing_data) if existing_data else {}
@@ -70,11 +103,86 @@ class WemPortalApi:
                 CONF_SCAN_INTERVAL_API, DEFAULT_CONF_SCAN_INTERVAL_API_VALUE
             )
         )
+        # Interval of each poll tier; the fast tier defaults to the API scan interval
+        self.poll_intervals = {
+            POLL_TIER_FAST: timedelta(
+                seconds=config.get(
+                    CONF_SCAN_INTERVAL_FAST,
+                    config.get(CONF_SCAN_INTERVAL_API, DEFAULT_CONF_SCAN_INTERVAL_API_VALUE),
+                )
+            ),
+            POLL_TIER_NORMAL: self.scan_interval_api,
+            POLL_TIER_SLOW: timedelta(
+                seconds=config.get(
+                    CONF_SCAN_INTERVAL_SLOW, DEFAULT_CONF_SCAN_INTERVAL_SLOW_VALUE
+                )
+            ),
+        }
+        # User selected tiers by ParameterID (casefolded)
+        self.poll_tier_overrides = {}
+        for option, tier in (
+            (CONF_SLOW_PARAMETERS, POLL_TIER_SLOW),
+            (CONF_FAST_PARAMETERS, POLL_TIER_FAST),
+        ):
+            for parameter_id in config.get(option, "").split(","):
+                if parameter_id.strip():
+                    self.poll_tier_overrides[parameter_id.strip().casefold()] = tier
+        # Time each poll tier was last read, per device
+        self.last_tier_poll = {}
         self.valid_login = False
         self.language = config.get(CONF_LANGUAGE, DEFAULT_CONF_LANGUAGE_VALUE)
-        self.session = None
+        # Web portal tabs scraped in web and both mode
+        self.web_tabs = [DEFAULT_WEB_TAB]
+        for tab in config.get(CONF_WEB_TABS, "").split(","):
+            tab = tab.strip().casefold().replace(" ", "_")
+            if not tab:
+                continue
+            if tab not in WEB_TABS:
+                _LOGGER.warning("Ignoring unknown web portal tab %s", tab)
+            elif tab not in self.web_tabs:
+                self.web_tabs.append(tab)
+        # aiohttp.ClientSession used for all mobile API calls. Home Assistant
+        # passes in a dedicated session; standalone use creates one on login.
+        self.session = session
+        self._owns_session = False
+        # Rate limiter every API call goes through
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        # Wall clock time the device/parameter catalog (self.modules) was fetched
+        self.catalog_fetched_at = None
+        self._revalidate_task = None
+        # Number of modules whose parameters are discovered concurrently
+        self.discovery_concurrency = PARAMETER_DISCOVERY_CONCURRENCY
+        # Observed DataAccess/Refresh latency per device
+        self.refresh_latency = RefreshLatencyTracker()
+        # Digest of the last DataAccess/Read values per request payload
+        self._last_values_digest = {}
+        # Digest of the last mapped Values block per device and module
+        self._module_digests = {}
+        # Compiled WemPortalDataMapper plans per device, rebuilt when the catalog changes
+        self.mapping_plans = {}
+        # Data keys per device changed by the last fetch_data
+        self.changed_keys = {}
+        # Data keys per device whose entities are all disabled in the entity registry
+        self.disabled_keys = {}
+        # CircuitTimes per "<device>:<module index>:<module type>:<parameter>"
+        self.schedule_cache = {}
+        # Queued writes per device: {(module index, module type, parameter): (value, futures)}
+        self._pending_writes = {}
+        self._write_tasks = {}
+        # Every running flush, _write_tasks only holds those still collecting writes
+        self._flush_tasks = set()
+        # Concurrent requests on an expired session log in again only once
+        self._login_lock = asyncio.Lock()
+        self._logged_in_at = 0.0
+        self._read_back_tasks = set()
+        # Written (module index, module type, parameter) per device, not read since
+        self._unconfirmed_writes = {}
+        # Called with {device: changed keys} after written values were read back into self.data
+        self.on_read_back = None
         self.modules = None
         self.webscraping_cookie = {}
+        # WemPortalScraper kept between runs, so its session skips the login
+        self.scraper = None
         self.last_scraping_update = None
         # Headers used for all API calls
         self.headers = {
@@ -84,7 +192,16 @@ class WemPortalApi:
             "Host": "www.wemportal.com"
         }
         self.scraping_mapper = {}
-        self.last_statistics_fetch = 0.0
+        # ParameterIDs mapped to their own entity because no scraped entity matched
+        self.scraping_unmatched = set()
+        # ScrapedTokenIndex per device, rebuilt after every scrape
+        self.scraped_indexes = {}
+        # Fetch time and energy sensor of every statistics group per "<device>:<group>"
+        self.statistics_cache = {}
+        # Statistics/Read series of the last fetch per "<device>:<group>", until imported
+        self.statistics = {}
+        # Start timestamp and running sum of the last imported statistics row per "<device>:<group>"
+        self.statistics_marks = {}
 
         # Used to keep track of how many update intervals to wait before retrying spider
         self.spider_wait_interval = 0
@@ -92,16 +209,130 @@ class WemPortalApi:
         self.spider_retry_count = 0
         self.api_version = None
 
-    def fetch_data(self, enabled_devices=None):
+    async def cancel_tasks(self):
+        """Cancel the background tasks, so no request is sent after unloading.
+
+        Queued writes fail with ParameterChangeError.
+        """
+        tasks = [*self._flush_tasks, *self._read_back_tasks]
+        if self._revalidate_task is not None:
+            tasks.append(self._revalidate_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._revalidate_task = None
+
+    async def close(self):
+        """Cancel the background tasks and close the aiohttp session if it was created by this object."""
+        await self.cancel_tasks()
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
+        await self.close_scraper()
+
+    async def close_scraper(self):
+        """Close the web scraper, so the next scrape starts a new session."""
+        if self.scraper is not None:
+            await self.scraper.close()
+            self.scraper = None
+
+    def export_state(self) -> dict:
+        """Return the state that should survive a Home Assistant restart."""
+        state = {
+            "account": self.username,
+            "backoff": self.scheduler.backoff.as_dict(),
+            "refresh_latency": self.refresh_latency.latency,
+            "schedules": self.schedule_cache,
+            "statistics": self.statistics_marks,
+            "statistics_cache": self.statistics_cache,
+            "scraping_mapper": self._matched_scraping_mapper(),
+            "scraping_language": self.language,
+            "webscraping_cookie": self.webscraping_cookie,
+        }
+        if self.modules:
+            state["catalog"] = {
+                "fetched_at": self.catalog_fetched_at,
+                "devices": {
+                    device_id: {
+                        "ConnectionStatus": self.data.get(device_id, {}).get("ConnectionStatus"),
+                        "modules": list(device_modules.values()),
+                    }
+                    for device_id, device_modules in self.modules.items()
+                },
+            }
+        return state
+
+    def _matched_scraping_mapper(self) -> dict:
+        """Return the scraping_mapper entries that matched scraped entities.
+
+        Parameters without a match map to their own API entity. They are not
+        persisted, so they are matched again after a failed scrape.
+        """
+        return {
+            param_id: scraped_entities
+            for param_id, scraped_entities in self.scraping_mapper.items()
+            if param_id not in self.scraping_unmatched
+        }
+
+    def restore_state(self, state: dict) -> None:
+        """Restore state saved by export_state."""
+        if not state or state.get("account") != self.username:
+            return
+        self.scheduler.backoff.restore(state.get("backoff", {}))
+        self.refresh_latency.latency.update(state.get("refresh_latency", {}))
+        self.schedule_cache.update(state.get("schedules", {}))
+        self.statistics_marks.update(state.get("statistics", {}))
+        self.statistics_cache.update(state.get("statistics_cache", {}))
+        # Scraped names are matched in the configured language
+        if state.get("scraping_language") == self.language:
+            for param_id, scraped_entities in state.get("scraping_mapper", {}).items():
+                self.scraping_mapper.setdefault(param_id, scraped_entities)
+        if not self.webscraping_cookie:
+            self.webscraping_cookie = state.get("webscraping_cookie") or {}
+
+        catalog = state.get("catalog")
+        if catalog and self.modules is None:
+            self.modules = {}
+            for device_id, device in catalog["devices"].items():
+                self.modules[device_id] = {
+                    (module["Index"], module["Type"]): module
+                    for module in device["modules"]
+                }
+                self.data.setdefault(device_id, {})["ConnectionStatus"] = device["ConnectionStatus"]
+            self.catalog_fetched_at = catalog.get("fetched_at")
+            _LOGGER.debug("Restored cached parameter catalog for devices %s", list(self.modules))
+
+    def _catalog_expired(self) -> bool:
+        return (
+            self.catalog_fetched_at is None
+            or time.time() - self.catalog_fetched_at > CATALOG_CACHE_TTL
+        )
+
+    async def _async_revalidate_catalog(self):
+        try:
+            await self.revalidate_catalog()
+        except Exception as exc:
+            _LOGGER.warning("Failed to revalidate the cached parameter catalog: %s", exc)
+
+    def _set_entity(self, device_id, key, entity):
+        """Store the data of an entity, remembering the key if it changed."""
+        if self.data[device_id].get(key) != entity:
+            self.changed_keys.setdefault(device_id, set()).add(key)
+        self.data[device_id][key] = entity
+
+    async def fetch_data(self, enabled_devices=None):
+        self.changed_keys = {}
         try:
             if self.mode != "web":
                 # Login and get device info
                 if not self.valid_login:
-                    self.api_login()
+                    await self.api_login()
                 # Fetch device and parameter data only at start, or recover missing metadata
                 if self.modules is None:
-                    self.get_devices()
-                    self.get_parameters()
+                    await self.get_devices()
+                    await self.get_parameters()
+                    self.catalog_fetched_at = time.time()
                 else:
                     needs_recovery = False
                     for _, modules in self.modules.items():
@@ -111,16 +342,23 @@ class WemPortalApi:
                                 break
                     if needs_recovery:
                         _LOGGER.info("Attempting to recover missing parameter definitions...")
-                        self.get_parameters()
+                        await self.get_parameters()
+                    # Cached catalog is used right away and refreshed in the background
+                    if self._catalog_expired() and (
+                        self._revalidate_task is None or self._revalidate_task.done()
+                    ):
+                        self._revalidate_task = asyncio.create_task(
+                            self._async_revalidate_catalog()
+                        )
 
             # Select data source based on mode
             if self.mode == "web":
                 # Get data by web scraping
-                webscraping_data = self.fetch_webscraping_data()
+                webscraping_data = await self.async_fetch_webscraping_data()
                 self._merge_webscraping_data(next(iter(self.data), "0000"), webscraping_data)
             elif self.mode == "api":
                 # Get data using API
-                self.get_data(enabled_devices)
+                await self.get_data(enabled_devices)
             else:
                 # Get data using web scraping if it hasn't been updated recently,
                 # otherwise use API to get data
@@ -137,8 +375,10 @@ class WemPortalApi:
                 ):
                     # Get data by web scraping
                     try:
-                        webscraping_data = self.fetch_webscraping_data()
+                        webscraping_data = await self.async_fetch_webscraping_data()
                         self._merge_webscraping_data(next(iter(self.data), "0000"), webscraping_data)
+                        # Scraped values replaced the mapped API values, map them again
+                        self._module_digests = {}
 
                         # Update last_scraping_update timestamp
                         self.last_scraping_update = datetime.now()
@@ -155,7 +395,7 @@ class WemPortalApi:
                     )
 
                 # Get data using API (always run as a resilient fallback)
-                self.get_data(enabled_devices)
+                await self.get_data(enabled_devices)
 
 
             # Return data
@@ -185,9 +425,15 @@ class WemPortalApi:
                     if isinstance(old_val, dict) and old_val.get("unit") is not None:
                         new_val["unit"] = old_val.get("unit")
                         
-            self.data[str(device_id)][key] = new_val
+            self._set_entity(str(device_id), key, new_val)
+
+        if self.mode == "both":
+            from .mapper import ScrapedTokenIndex
+            self.scraped_indexes[str(device_id)] = ScrapedTokenIndex(
+                self.data[str(device_id)], self.language
+            )
 
-    def fetch_webscraping_data(self):
+    async def async_fetch_webscraping_data(self):
         """
         Call scraper to crawl WEM Portal.
         This function manages the process of initiating a web scraping job, 
@@ -195,28 +441,33 @@ class WemPortalApi:
         """
         from .scraper import WemPortalScraper
 
-        # Set up the web scraping job with necessary parameters
-        scraper = WemPortalScraper(
-            self.username, 
-            self.password, 
-            self.webscraping_cookie
-        )
+        # Set up the web scraping job with necessary parameters, reusing the
+        # session of the previous run
+        if self.scraper is None:
+            self.scraper = WemPortalScraper(
+                self.username, 
+                self.password, 
+                self.webscraping_cookie,
+                self.web_tabs,
+            )
 
         try:
             # Attempt to run the scraping job and extract the first result
-            data = scraper.scrape()[0]
+            data = (await self.scraper.scrape())[0]
 
         except IndexError as exc:
             # Handle the case where the job result is not found
             self.spider_retry_count += 1
             if self.spider_retry_count == 2:
                 self.webscraping_cookie = None
+                await self.close_scraper()
             self.spider_wait_interval = self.spider_retry_count
             raise WemPortalError(DATA_GATHERING_ERROR) from exc
 
         except AuthError as exc:
             # Handle authentication errors
             self.webscraping_cookie = None
+            await self.close_scraper()
             raise AuthError(
                 "AuthenticationError: Could not login with provided username and password. "
                 "Check if your config contains the right credentials"
@@ -225,6 +476,7 @@ class WemPortalApi:
         except ExpiredSessionError as exc:
             # Handle errors due to expired session
             self.webscraping_cookie = None
+            await self.close_scraper()
             raise ExpiredSessionError(
                 "ExpiredSessionError: Session expired. Next update will try to login again."
             ) from exc
@@ -244,7 +496,17 @@ class WemPortalApi:
         # Return the scraped data
         return data
 
-    def api_login(self):
+    async def _renew_login(self, sent_at: float) -> None:
+        """Log in again after a request sent at sent_at found the session expired.
+
+        Skipped when another request renewed the session after sent_at.
+        """
+        async with self._login_lock:
+            if self._logged_in_at > sent_at:
+                return
+            await self.api_login()
+
+    async def api_login(self):
         payload = {
             "Name": self.username,
             "PasswordUTF8": self.password,
@@ -252,55 +514,68 @@ class WemPortalApi:
             "AppVersion": "2.0.2",
             "ClientOS": "Android",
         }
-        if self.session is not None:
-            self.session.close()
-        self.session = reqs.Session()
-        self.session.cookies.clear()
-        self.session.headers.update(self.headers)
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+            self._owns_session = True
+        # Drop cookies of a previous (possibly expired) session before logging in
+        self.session.cookie_jar.clear()
+        response = None
+        body = b""
+        sent_at = None
         try:
-            response = self.session.post(
+            await self.scheduler.acquire(API_LOGIN_URL)
+            sent_at = time.time()
+            async with self.session.post(
                 API_LOGIN_URL,
                 data=payload,
-            )
-            response.raise_for_status()
-            
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                body = await response.read()
+                response.raise_for_status()
+
             # Verify the response is actually valid JSON and successful
-            response_data = response.json()
+            response_data = json.loads(body)
             if response_data.get("Status") != 0:
                 raise AuthError(f"Login failed: Server returned {response_data}")
-                
+
             self.api_version = response_data.get("Version")
             _LOGGER.debug("API login successful for %s", self.username)
             self.valid_login = True
-            
+            self._logged_in_at = time.time()
+
         except ValueError as exc: # Catches JSONDecodeError if response is HTML
             _LOGGER.warning("API login failed for %s. Received HTML instead of JSON.", self.username)
+            self.scheduler.backoff.record_limited(sent_at)
             self.valid_login = False
             raise WemPortalError("API login failed: received HTML instead of JSON (Possible rate limit or WAF block)") from exc
-        except reqs.exceptions.HTTPError as exc:
+        except aiohttp.ClientResponseError as exc:
             _LOGGER.warning("API login failed for %s with HTTPError.", self.username)
             self.valid_login = False
-            response_status, response_message = self.get_response_details(response)
-            if response is None:
-                raise UnknownAuthError(
-                    "Authentication Error: Encountered an unknown authentication error."
-                ) from exc
-            elif response.status_code == 400:
+            response_status, response_message = self.get_response_details(body)
+            if exc.status == 400:
                 raise AuthError(
-                    f"Authentication Error: Check if your login credentials are correct. Received response code: {response.status_code}, response: {response.content}. Server returned internal status code: {response_status} and message: {response_message}"
+                    f"Authentication Error: Check if your login credentials are correct. Received response code: {exc.status}, response: {body}. Server returned internal status code: {response_status} and message: {response_message}"
                 ) from exc
-            elif response.status_code == 403:
+            elif exc.status == 403:
+                self.scheduler.backoff.record_limited(sent_at)
                 raise ForbiddenError(
                     f"WemPortal forbidden error: Server returned internal status code: {response_status} and message: {response_message}"
                 ) from exc
-            elif response.status_code == 500:
+            elif exc.status == 500:
                 raise ServerError(
                     f"WemPortal server error: Server returned internal status code: {response_status} and message: {response_message}"
                 ) from exc
             else:
                 raise UnknownAuthError(
-                    f"Authentication Error: Encountered an unknown authentication error. Received response code: {response.status_code}, response: {response.content}. Server returned internal status code: {response_status} and message: {response_message}"
+                    f"Authentication Error: Encountered an unknown authentication error. Received response code: {exc.status}, response: {body}. Server returned internal status code: {response_status} and message: {response_message}"
                 ) from exc
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            _LOGGER.warning("API login failed for %s: %s", self.username, exc)
+            self.valid_login = False
+            raise UnknownAuthError(
+                "Authentication Error: Encountered an unknown authentication error."
+            ) from exc
 
 
     def web_login(self):
@@ -368,109 +643,183 @@ class WemPortalApi:
                 raise ForbiddenError("Access forbidden during login.") from exc
             raise UnknownAuthError("Failed to submit the login form.") from exc
 
-    def get_response_details(self, response: reqs.Response):
+    def get_response_details(self, body: bytes):
         server_status = ""
         server_message = ""
-        if response:
+        if body:
             try:
-                response_data = response.json()
+                response_data = json.loads(body)
                 _LOGGER.debug(response_data)
                 # Status we get back from server
                 server_status = response_data["Status"]
                 server_message = response_data["Message"]
-            except (KeyError, ValueError):
+            except (KeyError, TypeError, ValueError):
                 pass
         return server_status, server_message
 
 
-    def make_api_call(
+    async def make_api_call(
         self, url: str, headers=None, data=None, do_retry=True, delay=5
-    ) -> reqs.Response:
+    ) -> dict:
+        """Call the mobile API and return the decoded JSON body."""
         attempts = 2 if do_retry else 1
-        response = None
 
         for attempt in range(attempts):
-            time.sleep(1)  # Wait 1 sec between requests to be graceful to the API.
+            await self.scheduler.acquire(url)
+            sent_at = time.time()
             current_headers = headers or self.headers.copy()
+            body = b""
 
             try:
                 if not data:
                     _LOGGER.debug("Sending GET request to %s with headers: %s", url, current_headers)
-                    response = self.session.get(url, headers=current_headers, timeout=10)
+                    request = self.session.get(
+                        url, headers=current_headers, timeout=aiohttp.ClientTimeout(total=10)
+                    )
                 else:
                     _LOGGER.debug("Sending POST request to %s with headers: %s and data: %s", url, current_headers, data)
-                    response = self.session.post(url, headers=current_headers, json=data, timeout=10)
+                    request = self.session.post(
+                        url, headers=current_headers, json=data, timeout=aiohttp.ClientTimeout(total=10)
+                    )
 
-                response.raise_for_status()
+                async with request as response:
+                    body = await response.read()
+                    response.raise_for_status()
 
-                # Check for stealthy session expiration (HTML redirect)
-                if "Account/Login" in response.url or (hasattr(response, "redirect_url") and response.redirect_url and "Account/Login" in str(response.redirect_url)):
-                    raise ExpiredSessionError("Redirected to Account/Login")
+                    # Check for stealthy session expiration (HTML redirect)
+                    if "Account/Login" in str(response.url):
+                        raise ExpiredSessionError("Redirected to Account/Login")
 
                 _LOGGER.debug(response)
-                return response
-
-            except (reqs.exceptions.RequestException, ExpiredSessionError) as exc:
+                try:
+                    result = json.loads(body) if body else {}
+                except ValueError as exc:
+                    self.scheduler.backoff.record_limited(sent_at)
+                    self.valid_login = False
+                    raise WemPortalError(
+                        f"{DATA_GATHERING_ERROR} Received HTML instead of JSON (Possible rate limit or WAF block)"
+                    ) from exc
+                self.scheduler.backoff.record_success()
+                return result
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, ExpiredSessionError) as exc:
+                if isinstance(exc, aiohttp.ClientResponseError) and exc.status == 403:
+                    self.scheduler.backoff.record_limited(sent_at)
                 is_auth_error = isinstance(exc, ExpiredSessionError) or (
-                    isinstance(exc, reqs.exceptions.RequestException)
-                    and response
-                    and response.status_code in (401, 403)
+                    isinstance(exc, aiohttp.ClientResponseError)
+                    and exc.status in (401, 403)
                 )
 
                 if is_auth_error and attempt < attempts - 1:
                     _LOGGER.info("Session expired for %s. Re-authenticating...", url)
-                    self.api_login()
-                    time.sleep(delay)
+                    await self._renew_login(sent_at)
+                    await asyncio.sleep(delay)
                     continue  # Loop back around and retry
 
                 # If we're out of retries or it's a completely different error:
-                server_status, server_message = self.get_response_details(response)
-                
+                server_status, server_message = self.get_response_details(body)
+
                 # The old logic recreated the entire API instance when this happened.
                 # To emulate that recovery mechanism without losing cached metadata,
-                # we invalidate the login state so the next cycle creates a fresh requests.Session.
+                # we invalidate the login state so the next cycle starts a fresh session.
                 self.valid_login = False
-                
+
                 raise WemPortalError(
                     f"{DATA_GATHERING_ERROR} Server returned status code: {server_status} and message: {server_message}"
                 ) from exc
 
-        return response
+        return {}
 
-    def get_devices(self):
+    async def get_devices(self):
         # Check if device data is already present
         if self.data and self.modules:
             _LOGGER.debug("Device data is already cached.")
             return
 
-        _LOGGER.debug("Fetching api device data")
-        self.modules = {}
         self.data = {}
-        data = self.make_api_call(API_DEVICE_READ_URL, do_retry=True).json()
+        self.modules = await self._read_devices()
+
+    async def _read_devices(self) -> dict:
+        """Read devices and their modules, updating ConnectionStatus in self.data."""
+        _LOGGER.debug("Fetching api device data")
+        modules = {}
+        data = await self.make_api_call(API_DEVICE_READ_URL, do_retry=True)
 
         for device in data["Devices"]:
             device_id_str = str(device["ID"])
-            self.data[device_id_str] = {}
-            self.modules[device_id_str] = {}
+            self.data.setdefault(device_id_str, {})
+            modules[device_id_str] = {}
             for module in device["Modules"]:
-                self.modules[device_id_str][(module["Index"], module["Type"])] = {
+                modules[device_id_str][(module["Index"], module["Type"])] = {
                     "Index": module["Index"],
                     "Type": module["Type"],
                     "Name": module["Name"],
                 }
             self.data[device_id_str]["ConnectionStatus"] = device["ConnectionStatus"]
+        return modules
+
+    async def revalidate_catalog(self):
+        """Refetch the device and parameter catalog and swap it in when complete."""
+        _LOGGER.debug("Revalidating cached device and parameter catalog")
+        modules = await self._read_devices()
+        await self.get_parameters(modules)
+        # Keep cached definitions for modules whose EventType/Read failed this time
+        for device_id, device_modules in modules.items():
+            for key, module in device_modules.items():
+                if "parameters" not in module:
+                    cached = (self.modules or {}).get(device_id, {}).get(key, {})
+                    if cached.get("parameters"):
+                        module["parameters"] = cached["parameters"]
+        self.modules = modules
+        self.catalog_fetched_at = time.time()
+        # Parameter definitions may have changed, map every module again
+        self._module_digests = {}
+        self.mapping_plans = {}
+
+    async def _read_module_parameters(self, device_id, values, semaphore, forbidden):
+        """EventType/Read for a single module.
+
+        Returns the decoded response, the WemPortalError that was raised, or None
+        if the read was skipped because discovery is being aborted.
+        """
+        async with semaphore:
+            if len(forbidden) >= 3:
+                return None
+            data = {
+                "DeviceID": int(device_id),
+                "ModuleIndex": values["Index"],
+                "ModuleType": values["Type"],
+            }
+            try:
+                return await self.make_api_call(
+                    API_EVENT_TYPE_READ_URL, data=data, do_retry=False
+                )
+            except WemPortalError as exc:
+                if (
+                    isinstance(exc.__cause__, aiohttp.ClientResponseError)
+                    and exc.__cause__.status == 403
+                ):
+                    forbidden.append((values["Index"], values["Type"]))
+                return exc
 
-    def get_parameters(self):
-        assert self.modules is not None
+    async def get_parameters(self, modules=None):
+        """Fetch parameter definitions for every module in ``modules`` (defaults to self.modules).
+
+        Modules are read concurrently, at most ``discovery_concurrency`` at a time.
+        Results are applied in module order, independent of completion order.
+        """
+        if modules is None:
+            modules = self.modules
+        assert modules is not None
+        semaphore = asyncio.Semaphore(self.discovery_concurrency)
         for device_id, device_data in self.data.items():
-            if device_data["ConnectionStatus"] != 0:
+            if device_data.get("ConnectionStatus") != 0 or device_id not in modules:
                 continue
             _LOGGER.debug("Fetching api parameters data for device %s", device_id)
             _LOGGER.debug(self.data)
-            _LOGGER.debug(self.modules[device_id])
-            delete_candidates = []
-            forbidden_count = 0
-            for key, values in self.modules[device_id].items():
+            _LOGGER.debug(modules[device_id])
+            pending = []
+            for key, values in modules[device_id].items():
                 # Check if parameters are already cached
                 if "parameters" in values and values["parameters"]:
                     _LOGGER.debug(
@@ -478,29 +827,31 @@ class WemPortalApi:
                         device_id, values["Index"], values["Type"]
                     )
                     continue
-                data = {
-                    "DeviceID": int(device_id),
-                    "ModuleIndex": values["Index"],
-                    "ModuleType": values["Type"],
-                }
-                try:
-                    time.sleep(5)
-                    response = self.make_api_call(
-                        API_EVENT_TYPE_READ_URL, data=data, do_retry=False
-                    )
-                except WemPortalError as exc:
-                    if isinstance(exc.__cause__, reqs.exceptions.HTTPError):
-                        status_code = exc.__cause__.response.status_code
+                pending.append(values)
+
+            forbidden = []
+            results = await asyncio.gather(
+                *(
+                    self._read_module_parameters(device_id, values, semaphore, forbidden)
+                    for values in pending
+                )
+            )
+            if pending:
+                # Compiled again with the new parameter definitions
+                self.mapping_plans.pop(device_id, None)
+
+            delete_candidates = []
+            forbidden_count = 0
+            error = None
+            for values, response in zip(pending, results):
+                if response is None:
+                    continue
+                if isinstance(response, WemPortalError):
+                    exc = response
+                    if isinstance(exc.__cause__, aiohttp.ClientResponseError):
+                        status_code = exc.__cause__.status
                         if status_code == 403:
                             forbidden_count += 1
-                            if forbidden_count >= 3:
-                                _LOGGER.error(
-                                    "Rate limited (403) three times while fetching parameters "
-                                    "for device %s. Aborting.",
-                                    device_id
-                                )
-                                raise ForbiddenError("Rate limited during get_parameters") from exc
-                            
                             _LOGGER.warning(
                                 "Rate limit warning (403) for device %s module %s. Strike %s of 3.",
                                 device_id,
@@ -517,15 +868,16 @@ class WemPortalApi:
                             )
                             delete_candidates.append((values["Index"], values["Type"]))
                             continue
-                    raise
+                    error = error or exc
+                    continue
                 parameters = {}
                 try:
-                    for parameter in response.json()["Parameters"]:
+                    for parameter in response["Parameters"]:
                         parameters[parameter["ParameterID"]] = parameter
                     if not parameters:
                         delete_candidates.append((values["Index"], values["Type"]))
                     else:
-                        self.modules[device_id][(values["Index"], values["Type"])][
+                        modules[device_id][(values["Index"], values["Type"])][
                             "parameters"
                         ] = parameters
                 except KeyError:
@@ -537,9 +889,19 @@ class WemPortalApi:
                     )
                     continue
             for key in delete_candidates:
-                del self.modules[device_id][key]
+                del modules[device_id][key]
+
+            if forbidden_count >= 3:
+                _LOGGER.error(
+                    "Rate limited (403) three times while fetching parameters "
+                    "for device %s. Aborting.",
+                    device_id
+                )
+                raise ForbiddenError("Rate limited during get_parameters")
+            if error is not None:
+                raise error
 
-    def change_value(
+    async def change_value(
         self,
         device_id,
         parameter_id,
@@ -548,39 +910,240 @@ class WemPortalApi:
         numeric_value,
         login=True,
     ):
-        """POST request to API to change a specific value"""
+        """POST request to API to change a specific value.
+
+        Writes to the same device within WRITE_COALESCE_DELAY are sent as one
+        DataAccess/Write request. The last value per parameter wins.
+        """
         _LOGGER.debug("Changing value for %s", parameter_id)
 
-        data = {
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending_writes.setdefault(device_id, {})
+        key = (int(module_index), int(module_type), parameter_id)
+        _, waiters = pending.get(key, (None, []))
+        pending[key] = (float(numeric_value), [*waiters, future])
+        if device_id not in self._write_tasks:
+            task = asyncio.create_task(self._flush_writes(device_id))
+            self._write_tasks[device_id] = task
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        await future
+
+    @staticmethod
+    def _write_request(device_id, pending) -> dict:
+        """Return the DataAccess/Write body of the pending writes of a device."""
+        modules = {}
+        for (module_index, module_type, parameter_id), (numeric_value, _) in pending.items():
+            modules.setdefault((module_index, module_type), []).append(
+                {
+                    "ParameterID": parameter_id,
+                    "NumericValue": numeric_value,
+                }
+            )
+        return {
             "DeviceID": int(device_id),
             "Modules": [
                 {
-                    "ModuleIndex": int(module_index),
-                    "ModuleType": int(module_type),
-                    "Parameters": [
-                        {
-                            "ParameterID": parameter_id,
-                            "NumericValue": float(numeric_value),
-                        }
-                    ],
+                    "ModuleIndex": module_index,
+                    "ModuleType": module_type,
+                    "Parameters": parameters,
                 }
+                for (module_index, module_type), parameters in modules.items()
             ],
         }
-        # _LOGGER.info(data)
 
+    async def _flush_writes(self, device_id):
+        """Send the pending writes of a device as one request.
+
+        Every waiter is resolved, also when the request cannot be built or the
+        flush is cancelled. Waiters cancelled by their caller are skipped.
+        """
+        pending = {}
+        sent = False
+        error = None
         try:
-            self.make_api_call(
+            await asyncio.sleep(WRITE_COALESCE_DELAY)
+            # Writes queued from now on go into the next request
+            del self._write_tasks[device_id]
+            pending = self._pending_writes.pop(device_id, {})
+            await self.make_api_call(
                 API_DATA_ACCESS_WRITE_URL,
-                data=data,
+                data=self._write_request(device_id, pending),
                 do_retry=True
             )
+            sent = True
+
+            self._unconfirmed_writes.setdefault(device_id, set()).update(pending)
+            for module_index, module_type, parameter_id in pending:
+                self.invalidate_schedule(device_id, module_index, module_type, parameter_id)
+            task = asyncio.create_task(self._read_back(device_id, list(pending)))
+            self._read_back_tasks.add(task)
+            task.add_done_callback(self._read_back_tasks.discard)
         except Exception as exc:
-            raise ParameterChangeError(
-                f"Error changing parameter {parameter_id} value"
-            ) from exc
+            error = exc
+        finally:
+            if self._write_tasks.get(device_id) is asyncio.current_task():
+                # Cancelled while waiting for more writes
+                del self._write_tasks[device_id]
+                pending = self._pending_writes.pop(device_id, {})
+            parameter_ids = ", ".join(parameter_id for _, _, parameter_id in pending)
+            for _, waiters in pending.values():
+                for future in waiters:
+                    if future.done():
+                        continue
+                    if sent:
+                        future.set_result(None)
+                        continue
+                    failure = ParameterChangeError(f"Error changing parameter {parameter_ids} value")
+                    failure.__cause__ = error
+                    future.set_exception(failure)
+
+    async def _read_back(self, device_id, written):
+        """Read the written parameters back so clamped or rejected values show up.
+
+        Only the written (module, parameter) pairs are refreshed and read.
+        on_read_back is called with the changed data keys per device once the
+        values are in self.data. The keys of the written parameters are always
+        included, since their entities hold the optimistically written value
+        even when the device rejected the write and the data is unchanged.
+        """
+        await asyncio.sleep(WRITE_READ_BACK_DELAY)
+        modules = {}
+        for module_index, module_type, parameter_id in written:
+            modules.setdefault((module_index, module_type), []).append(
+                {"ParameterID": parameter_id}
+            )
+        data = {
+            "DeviceID": int(device_id),
+            "Modules": [
+                {
+                    "ModuleIndex": module_index,
+                    "ModuleType": module_type,
+                    "Parameters": parameters,
+                }
+                for (module_index, module_type), parameters in modules.items()
+            ],
+        }
+        changed_keys = set()
+        try:
+            values = await self.refresh_and_read(device_id, data)
+            from .mapper import WemPortalDataMapper
+            WemPortalDataMapper.process_api_values(
+                device_id=device_id,
+                values_json=values,
+                modules_dict=self.modules,
+                language=self.language,
+                scraping_mapper=self.scraping_mapper,
+                scraping_unmatched=self.scraping_unmatched,
+                mode=self.mode,
+                api_data=self.data,
+                mapping_plan=self.get_mapping_plan(device_id),
+                changed_keys=changed_keys,
+            )
+        except Exception as exc:
+            _LOGGER.warning("Failed to read back written values of device %s: %s", device_id, exc)
+            return
+        changed_keys |= self._pop_written_keys(device_id, values)
+        if self.on_read_back is not None and changed_keys:
+            self.on_read_back({device_id: changed_keys})
+
+    def is_parameter_needed(self, device_id, module, parameter_id) -> bool:
+        """Return False if every entity backed by this parameter is disabled.
+
+        In "both" mode a parameter feeds the scraped entities it was matched
+        to in scraping_mapper, otherwise its own "<module>-<parameter>" entity.
+        Parameters without an entity yet are always needed.
+        """
+        disabled = self.disabled_keys.get(device_id)
+        if not disabled:
+            return True
+        targets = self.scraping_mapper.get(parameter_id) or [
+            f"{module['Name']}-{parameter_id}"
+        ]
+        return any(key not in disabled for key in targets)
+
+    def get_parameter_tier(self, device_id, module, parameter_id) -> str:
+        """Return the poll tier of a parameter."""
+        from .mapper import get_poll_tier
+
+        parameter = module["parameters"][parameter_id]
+        unit = parameter.get("Unit")
+        if unit is None:
+            # EventType/Read may not carry the unit, use the one of the last read
+            entity = self.data.get(device_id, {}).get(f"{module['Name']}-{parameter_id}")
+            if isinstance(entity, dict):
+                unit = entity.get("unit")
+        return get_poll_tier(parameter, unit, self.poll_tier_overrides)
+
+    def _due_poll_tiers(self, device_id) -> set:
+        """Return the poll tiers of a device whose interval has elapsed."""
+        now = datetime.now()
+        last_poll = self.last_tier_poll.get(device_id, {})
+        return {
+            tier
+            for tier, interval in self.poll_intervals.items()
+            if tier not in last_poll
+            or now - last_poll[tier] + timedelta(seconds=10) > interval
+        }
+
+    async def refresh_and_read(self, device_id, data):
+        """Run DataAccess/Refresh and read the values as soon as they are fresh.
+
+        The Refresh response carries no job to poll. The first read is timed
+        at the device's typical refresh latency. Unchanged values cannot be
+        told apart from a refresh that has not landed yet, so a read is only
+        repeated on an explicit not-ready answer (non-zero Status or modules
+        without Values), with exponential back off. An early probe before the
+        typical latency is only accepted with changed values. The last probe
+        is accepted whatever it returns.
+
+        The latency is the time waited after the Refresh response, without
+        the scheduler waits and round trips of the requests.
+        """
+        await self.make_api_call(
+            API_REFRESH_URL,
+            data=data,
+        )
+        # Payloads differ between cycles (poll tiers), compare like with like
+        request_key = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        previous_digest = self._last_values_digest.get(request_key)
+        expected = self.refresh_latency.expected(device_id)
+        delays = self.refresh_latency.probe_delays(device_id, REFRESH_MAX_PROBES)
+        waited = 0.0
+        for probe, delay in enumerate(delays, start=1):
+            await asyncio.sleep(delay)
+            waited += delay
+            values = await self.make_api_call(
+                API_DATA_ACCESS_READ_URL,
+                data=data,
+                do_retry=True
+            )
+            modules = values.get("Modules")
+            ready = (
+                values.get("Status", 0) == 0
+                and bool(modules)
+                and all(module.get("Values") for module in modules)
+            )
+            digest = hashlib.sha1(
+                json.dumps(modules or [], sort_keys=True).encode()
+            ).hexdigest()
+            # Only changed values prove when the refresh landed
+            landed = ready and previous_digest is not None and digest != previous_digest
+            if probe == 1 and delay < expected and not landed:
+                continue
+            if ready or probe == len(delays):
+                if landed:
+                    self.refresh_latency.record(device_id, waited)
+                _LOGGER.debug(
+                    "Read values of device %s %.1fs after refresh (probe %s, ready: %s)",
+                    device_id, waited, probe, ready
+                )
+                self._last_values_digest[request_key] = digest
+                return values
+        return {}
 
     # Refresh data and retrieve new data
-    def get_data(self, enabled_devices=None):
+    async def get_data(self, enabled_devices=None):
         _LOGGER.debug("Fetching fresh api data. enabled_devices=%s, self.data.keys()=%s", enabled_devices, list(self.data.keys()))
         target_devices = enabled_devices if enabled_devices else list(self.data.keys())
         _LOGGER.debug("Computed target_devices=%s", target_devices)
@@ -591,16 +1154,19 @@ class WemPortalApi:
                 
             # 1. Fetch Device Status First
             try:
-                status_response = self.make_api_call(
+                status_response = await self.make_api_call(
                     API_DEVICE_STATUS_READ_URL,
                     data={"DeviceID": int(device_id)},
                     do_retry=True
-                ).json()
+                )
 
                 status_map = {0: "online", 7: "wrong_secret", 8: "busy", 50: "offline"}
                 conn_status = status_map.get(status_response.get("ConnectionStatus", -1), "unknown")
 
-                self.data[device_id][f"{device_id}-ConnectionStatus"] = {
+                errors = status_response.get("Errors", [])
+                has_errors = "Yes" if errors else "No"
+                error_msg = ", ".join([str(e) for e in errors]) if errors else "None"
+                self._set_entity(device_id, f"{device_id}-ConnectionStatus", {
                     "friendlyName": "Connection Status",
                     "ParameterID": "ConnectionStatus",
                     "unit": None,
@@ -611,13 +1177,9 @@ class WemPortalApi:
                     "ModuleType": -1,
                     "platform": "sensor",
                     "icon": "mdi:network"
-                }
+                })
 
-                errors = status_response.get("Errors", [])
-                has_errors = "Yes" if errors else "No"
-                error_msg = ", ".join([str(e) for e in errors]) if errors else "None"
-
-                self.data[device_id][f"{device_id}-HasErrors"] = {
+                self._set_entity(device_id, f"{device_id}-HasErrors", {
                     "friendlyName": "Has Errors",
                     "ParameterID": "HasErrors",
                     "unit": None,
@@ -628,9 +1190,9 @@ class WemPortalApi:
                     "ModuleType": -1,
                     "platform": "sensor",
                     "icon": "mdi:alert"
-                }
+                })
 
-                self.data[device_id][f"{device_id}-ErrorMessages"] = {
+                self._set_entity(device_id, f"{device_id}-ErrorMessages", {
                     "friendlyName": "Error Messages",
                     "ParameterID": "ErrorMessages",
                     "unit": None,
@@ -641,7 +1203,7 @@ class WemPortalApi:
                     "ModuleType": -1,
                     "platform": "sensor",
                     "icon": "mdi:message-alert"
-                }
+                })
 
                 if conn_status != "online":
                     _LOGGER.warning("Device %s is %s. Skipping data polling.", device_id, conn_status)
@@ -650,146 +1212,337 @@ class WemPortalApi:
             except Exception as exc:
                 _LOGGER.warning("Failed to fetch Device Status: %s", exc)
 
-            # 2. Proceed with data fetch
+            # 2. Proceed with data fetch, only for the poll tiers that are due
+            due_tiers = self._due_poll_tiers(device_id)
             try:
                 data = {
                     "DeviceID": int(device_id),
-                    "Modules": [
-                        {
-                            "ModuleIndex": module["Index"],
-                            "ModuleType": module["Type"],
-                            "Parameters": [
-                                {"ParameterID": parameter}
-                                for parameter in module["parameters"].keys()
-                            ],
-                        }
-                        for module in self.modules[device_id].values()
-                        if "parameters" in module and module["parameters"]
-                    ],
+                    "Modules": [],
                 }
+                for module in self.modules[device_id].values():
+                    if "parameters" not in module or not module["parameters"]:
+                        continue
+                    parameters = [
+                        {"ParameterID": parameter}
+                        for parameter in module["parameters"].keys()
+                        if self.is_parameter_needed(device_id, module, parameter)
+                        and self.get_parameter_tier(device_id, module, parameter) in due_tiers
+                    ]
+                    if parameters:
+                        data["Modules"].append(
+                            {
+                                "ModuleIndex": module["Index"],
+                                "ModuleType": module["Type"],
+                                "Parameters": parameters,
+                            }
+                        )
             except KeyError as exc:
                 _LOGGER.debug("%s: %s", DATA_GATHERING_ERROR, self.modules[device_id])
                 raise WemPortalError(DATA_GATHERING_ERROR) from exc
 
-            try:
-                self.make_api_call(
-                    API_REFRESH_URL,
-                    data=data,
-                )
-                time.sleep(5)
-                values = self.make_api_call(
-                    API_DATA_ACCESS_READ_URL,
-                    data=data,
-                    do_retry=True
-                ).json()
-                from .mapper import WemPortalDataMapper
-                WemPortalDataMapper.process_api_values(
-                    device_id=device_id,
-                    values_json=values,
-                    modules_dict=self.modules,
-                    language=self.language,
-                    scraping_mapper=self.scraping_mapper,
-                    mode=self.mode,
-                    api_data=self.data,
-                )
-            except Exception as exc:
-                _LOGGER.warning("Failed to fetch parameter data... %s", exc)
+            # Current DataAccess values of schedule parameters read this cycle
+            program_values = {}
+            if not data["Modules"]:
+                _LOGGER.debug("No enabled parameters of device %s are due (tiers %s). Skipping DataAccess read.", device_id, due_tiers)
+            else:
+                try:
+                    _LOGGER.debug("Polling tiers %s of device %s", due_tiers, device_id)
+                    values = await self.refresh_and_read(device_id, data)
+                    program_values = self._get_program_values(device_id, values)
+                    polled_at = datetime.now()
+                    for tier in due_tiers:
+                        self.last_tier_poll.setdefault(device_id, {})[tier] = polled_at
+                    # Entities of written parameters are refreshed even if their value is unchanged
+                    self.changed_keys.setdefault(device_id, set()).update(
+                        self._pop_written_keys(device_id, values)
+                    )
+                    changed = self._changed_modules(device_id, values)
+                    if not changed["Modules"]:
+                        _LOGGER.debug("Values of device %s are unchanged. Skipping mapping.", device_id)
+                    else:
+                        from .mapper import WemPortalDataMapper
+                        WemPortalDataMapper.process_api_values(
+                            device_id=device_id,
+                            values_json=changed,
+                            modules_dict=self.modules,
+                            language=self.language,
+                            scraping_mapper=self.scraping_mapper,
+                            scraping_unmatched=self.scraping_unmatched,
+                            mode=self.mode,
+                            api_data=self.data,
+                            mapping_plan=self.get_mapping_plan(device_id),
+                            changed_keys=self.changed_keys.setdefault(device_id, set()),
+                            scraped_index=self.scraped_indexes.get(device_id),
+                        )
+                except Exception as exc:
+                    # Map every module again next time
+                    self._module_digests.pop(device_id, None)
+                    _LOGGER.warning("Failed to fetch parameter data... %s", exc)
 
             # 3. Fetch Heating Schedules (DataType == 6)
             try:
-                for module in self.modules[device_id].values():
-                    module_index = module.get("Index")
-                    module_type = module.get("Type")
-                    if "parameters" in module:
-                        for param_id, param_data in module["parameters"].items():
-                            if param_data.get("DataType") == 6:  # WemDataType.PROGRAM
-                                try:
-                                    refresh_payload = {
-                                        "DeviceID": int(device_id),
-                                        "ModuleIndex": module_index,
-                                        "ModuleType": module_type,
-                                        "ParameterID": param_id
-                                    }
-
-                                    job_resp = self.make_api_call(
-                                        API_CIRCUIT_TIMES_REFRESH_URL,
-                                        data=refresh_payload,
-                                        do_retry=True
-                                    ).json()
-
-                                    job_id = job_resp.get("JobID")
-                                    if job_id is None:
-                                        continue
-
-                                    time.sleep(2)  # Give backend time to build the schedule payload
-
-                                    read_payload = {
-                                        "DeviceID": int(device_id),
-                                        "JobID": job_id,
-                                        "ModuleIndex": module_index,
-                                        "ModuleType": module_type,
-                                        "ParameterID": param_id
-                                    }
-
-                                    schedule_resp = self.make_api_call(
-                                        API_CIRCUIT_TIMES_READ_URL,
-                                        data=read_payload,
-                                        do_retry=True
-                                    ).json()
-
-                                    sensor_name = f"{module['Name']}-{param_id}"
-                                    if sensor_name not in self.data[device_id]:
-                                        from .translations import friendly_name_mapper, translate
-                                        self.data[device_id][sensor_name] = {
-                                            "friendlyName": translate(self.language, friendly_name_mapper(param_id)),
-                                            "ParameterID": param_id,
-                                            "unit": None,
-                                            "value": "Active",
-                                            "IsWriteable": False,
-                                            "DataType": 6,
-                                            "ModuleIndex": module_index,
-                                            "ModuleType": module_type,
-                                            "platform": "sensor",
-                                            "icon": "mdi:calendar-clock",
-                                        }
-
-                                    self.data[device_id][sensor_name]["CircuitTimesDay"] = schedule_resp.get("CircuitTimesDay", [])
-                                    self.data[device_id][sensor_name]["PossibleValues"] = schedule_resp.get("PossibleValues", [])
-                                    self.data[device_id][sensor_name]["value"] = "Active"
-
-                                except Exception as exc:
-                                    _LOGGER.warning("Failed to fetch CircuitTimes for %s: %s", param_id, exc)
+                await self.get_schedules(device_id, program_values)
             except Exception as exc:
                 _LOGGER.warning("Error processing CircuitTimes: %s", exc)
 
         # 4. Fetch Energy Statistics (Rate limited)
-        self.get_statistics(enabled_devices)
+        await self.get_statistics(enabled_devices)
+
+    def get_mapping_plan(self, device_id) -> dict:
+        """Return the compiled mapping plan of a device's parameters."""
+        if device_id not in self.mapping_plans:
+            from .mapper import compile_mapping_plan
+            self.mapping_plans[device_id] = compile_mapping_plan(
+                self.modules[device_id], self.language
+            )
+        return self.mapping_plans[device_id]
 
-    def get_statistics(self, enabled_devices=None):
-        """Fetch historical statistics from the API, rate limited to once per hour."""
-        now = time.time()
-        if self.last_statistics_fetch is not None and (now - self.last_statistics_fetch) < 3600:
-            return
-            
-        self.last_statistics_fetch = now
-        _LOGGER.debug("Fetching statistics data")
-        
+    def _pop_written_keys(self, device_id, values) -> set:
+        """Return the data keys of written parameters contained in a read.
+
+        Their entities show the optimistically written value until the value
+        read from the device is published, which may equal the data already
+        held when the device rejected the write. The parameters count as
+        confirmed afterwards.
+        """
+        written = self._unconfirmed_writes.get(device_id)
+        if not written:
+            return set()
+        mapping_plan = self.get_mapping_plan(device_id)
+        keys = set()
+        for module in values.get("Modules", []):
+            module_plan = mapping_plan.get((module["ModuleIndex"], module["ModuleType"]), {})
+            for value in module.get("Values", []):
+                parameter = (module["ModuleIndex"], module["ModuleType"], value["ParameterID"])
+                if parameter not in written:
+                    continue
+                written.discard(parameter)
+                if value["ParameterID"] in module_plan:
+                    keys.add(module_plan[value["ParameterID"]].key)
+        return keys
+
+    def _changed_modules(self, device_id, values) -> dict:
+        """Return the DataAccess/Read response reduced to modules whose values changed.
+
+        Digests are kept per module and set of read parameters, since the poll
+        tiers read different parameters of a module in different cycles.
+        """
+        digests = self._module_digests.setdefault(device_id, {})
+        modules = []
+        for module in values.get("Modules", []):
+            module_values = module.get("Values", [])
+            key = (
+                module.get("ModuleIndex"),
+                module.get("ModuleType"),
+                ",".join(sorted(str(value.get("ParameterID")) for value in module_values)),
+            )
+            digest = hashlib.sha1(json.dumps(module_values, sort_keys=True).encode()).hexdigest()
+            if digests.get(key) != digest:
+                digests[key] = digest
+                modules.append(module)
+        return {**values, "Modules": modules}
+
+    def _get_program_values(self, device_id, values) -> dict:
+        """Return the DataAccess values of schedule (PROGRAM) parameters by cache key."""
+        program_values = {}
+        for module in values.get("Modules", []):
+            device_module = self.modules[device_id].get(
+                (module["ModuleIndex"], module["ModuleType"]), {}
+            )
+            for value in module.get("Values", []):
+                parameter = device_module.get("parameters", {}).get(value["ParameterID"], {})
+                if parameter.get("DataType") == 6:  # WemDataType.PROGRAM
+                    key = self._schedule_cache_key(
+                        device_id, module["ModuleIndex"], module["ModuleType"], value["ParameterID"]
+                    )
+                    program_values[key] = [value.get("NumericValue"), value.get("StringValue")]
+        return program_values
+
+    @staticmethod
+    def _schedule_cache_key(device_id, module_index, module_type, parameter_id) -> str:
+        return f"{device_id}:{module_index}:{module_type}:{parameter_id}"
+
+    def invalidate_schedule(self, device_id, module_index, module_type, parameter_id):
+        """Drop a cached schedule so it is fetched again on the next cycle."""
+        self.schedule_cache.pop(
+            self._schedule_cache_key(device_id, module_index, module_type, parameter_id), None
+        )
+
+    async def get_schedules(self, device_id, program_values=None):
+        """Fetch CircuitTimes of the device's schedule parameters.
+
+        Schedules are cached for SCHEDULE_CACHE_TTL. An entry is fetched again
+        earlier when the schedule parameter's DataAccess value changes or the
+        parameter is written. Stale schedules are refreshed as one pipeline:
+        all Refresh jobs are started, then all of them are read.
+        """
+        if program_values is None:
+            program_values = {}
+        schedules = []
+        stale = []
+        for module in self.modules[device_id].values():
+            if "parameters" not in module:
+                continue
+            for param_id, param_data in module["parameters"].items():
+                if param_data.get("DataType") != 6 or not self.is_parameter_needed(  # WemDataType.PROGRAM
+                    device_id, module, param_id
+                ):
+                    continue
+                key = self._schedule_cache_key(device_id, module.get("Index"), module.get("Type"), param_id)
+                cached = self.schedule_cache.get(key)
+                schedules.append((key, module, param_id))
+                if (
+                    cached is None
+                    or time.time() - cached["fetched_at"] >= SCHEDULE_CACHE_TTL
+                    or program_values.get(key, cached["value"]) != cached["value"]
+                ):
+                    stale.append((key, module, param_id))
+
+        if stale:
+            results = await self._read_schedules(device_id, stale)
+            for (key, module, param_id), schedule_resp in zip(stale, results):
+                if isinstance(schedule_resp, Exception):
+                    _LOGGER.warning("Failed to fetch CircuitTimes for %s: %s", param_id, schedule_resp)
+                    continue
+                if schedule_resp is None:
+                    continue
+                cached = self.schedule_cache.get(key)
+                self.schedule_cache[key] = {
+                    "fetched_at": time.time(),
+                    "value": program_values.get(key, cached["value"] if cached else None),
+                    "CircuitTimesDay": schedule_resp.get("CircuitTimesDay", []),
+                    "PossibleValues": schedule_resp.get("PossibleValues", []),
+                }
+
+        for key, module, param_id in schedules:
+            schedule_resp = self.schedule_cache.get(key)
+            if schedule_resp is None:
+                continue
+            sensor_name = f"{module['Name']}-{param_id}"
+            sensor = self.data[device_id].get(sensor_name)
+            if sensor is None:
+                from .translations import friendly_name_mapper, translate
+                sensor = {
+                    "friendlyName": translate(self.language, friendly_name_mapper(param_id)),
+                    "ParameterID": param_id,
+                    "unit": None,
+                    "value": "Active",
+                    "IsWriteable": False,
+                    "DataType": 6,
+                    "ModuleIndex": module.get("Index"),
+                    "ModuleType": module.get("Type"),
+                    "platform": "sensor",
+                    "icon": "mdi:calendar-clock",
+                }
+
+            self._set_entity(device_id, sensor_name, {
+                **sensor,
+                "CircuitTimesDay": schedule_resp.get("CircuitTimesDay", []),
+                "PossibleValues": schedule_resp.get("PossibleValues", []),
+                "value": "Active",
+            })
+
+    async def _read_schedules(self, device_id, schedules) -> list:
+        """Run CircuitTimes Refresh/Read jobs for several schedule parameters.
+
+        Returns one result per entry of ``schedules``: the Read response, None
+        when no job was started, or the exception that was raised.
+        """
+
+        def payload(module, param_id):
+            return {
+                "DeviceID": int(device_id),
+                "ModuleIndex": module.get("Index"),
+                "ModuleType": module.get("Type"),
+                "ParameterID": param_id,
+            }
+
+        # Phase 1: start every job
+        jobs = await asyncio.gather(
+            *(
+                self.make_api_call(
+                    API_CIRCUIT_TIMES_REFRESH_URL,
+                    data=payload(module, param_id),
+                    do_retry=True,
+                )
+                for _, module, param_id in schedules
+            ),
+            return_exceptions=True,
+        )
+
+        # Give backend time to build the schedule payloads
+        await asyncio.sleep(SCHEDULE_JOB_DELAY)
+
+        # Phase 2: read every job, retrying the ones that are not ready on their own
+        async def read_job(module, param_id, job_resp):
+            if isinstance(job_resp, Exception):
+                return job_resp
+            job_id = job_resp.get("JobID")
+            if job_id is None:
+                return None
+            read_payload = {**payload(module, param_id), "JobID": job_id}
+            delay = SCHEDULE_JOB_DELAY / 2
+            for attempt in range(SCHEDULE_JOB_READS):
+                schedule_resp = await self.make_api_call(
+                    API_CIRCUIT_TIMES_READ_URL,
+                    data=read_payload,
+                    do_retry=True,
+                )
+                if "CircuitTimesDay" in schedule_resp or attempt == SCHEDULE_JOB_READS - 1:
+                    return schedule_resp
+                _LOGGER.debug("CircuitTimes job %s for %s not ready yet", job_id, param_id)
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        return await asyncio.gather(
+            *(
+                read_job(module, param_id, job_resp)
+                for (_, module, param_id), job_resp in zip(schedules, jobs)
+            ),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    def _statistics_due(entry) -> bool:
+        return time.time() - entry["fetched_at"] >= STATISTICS_INTERVAL
+
+    async def get_statistics(self, enabled_devices=None):
+        """Fetch historical statistics from the API.
+
+        Every statistics group is read at most once per STATISTICS_INTERVAL.
+        Until then its cached energy sensor is reused, also after a restart.
+        """
         target_devices = enabled_devices if enabled_devices else list(self.data.keys())
         for device_id in target_devices:
             if device_id not in self.data:
                 continue
+            cached = {
+                key: entry
+                for key, entry in self.statistics_cache.items()
+                if entry["device_id"] == device_id
+            }
+            for entry in cached.values():
+                if entry["sensor_name"] not in self.data[device_id]:
+                    self._set_entity(device_id, entry["sensor_name"], entry["sensor"])
+            if cached and not any(self._statistics_due(entry) for entry in cached.values()):
+                continue
+
+            _LOGGER.debug("Fetching statistics data of device %s", device_id)
             try:
-                refresh_resp = self.make_api_call(
+                refresh_resp = await self.make_api_call(
                     API_STATISTICS_REFRESH_URL,
                     data={"DeviceID": int(device_id)},
                     do_retry=True
-                ).json()
+                )
                 
                 group_types = refresh_resp.get("GroupTypeDescriptions", [])
                 headers = {"X-Api-Version": "2.0.0.0"}
                 
                 for group in group_types:
                     group_id = group.get("GroupType")
+                    cache_key = f"{device_id}:{group_id}"
+                    if cache_key in cached and not self._statistics_due(cached[cache_key]):
+                        continue
                     group_name = group.get("Description")
                     if not group_name or group_name.strip() == "":
                         fallback_names = {
@@ -820,13 +1573,12 @@ class WemPortalApi:
                     }
                     
                     try:
-                        time.sleep(2)  # Avoid hammering the API
-                        stats_resp = self.make_api_call(
+                        stats_resp = await self.make_api_call(
                             API_STATISTICS_READ_URL,
                             headers=headers,
                             data=read_payload,
                             do_retry=True
-                        ).json()
+                        )
                         
                         values = stats_resp.get("Values", [])
                         if not values:
@@ -836,10 +1588,17 @@ class WemPortalApi:
                         latest_stat = values[-1]
                         current_value = latest_stat.get("Value", 0.0)
                         unit = stats_resp.get("Unit", "kWh")
+                        self.statistics[f"{device_id}:{group_id}"] = {
+                            "device_id": device_id,
+                            "group_id": group_id,
+                            "name": group_name,
+                            "unit": unit,
+                            "values": values,
+                        }
                         
                         sensor_name = f"Energy_{group_id}"
                         
-                        self.data[device_id][f"{device_id}-{sensor_name}"] = {
+                        sensor = {
                             "friendlyName": group_name,
                             "ParameterID": sensor_name,
                             "unit": unit,
@@ -853,6 +1612,13 @@ class WemPortalApi:
                             "device_class": "energy",
                             "state_class": "total_increasing"
                         }
+                        self._set_entity(device_id, f"{device_id}-{sensor_name}", sensor)
+                        self.statistics_cache[cache_key] = {
+                            "device_id": device_id,
+                            "fetched_at": time.time(),
+                            "sensor_name": f"{device_id}-{sensor_name}",
+                            "sensor": sensor,
+                        }
                         
                     except Exception as exc:
                         _LOGGER.warning("Failed to fetch Statistics for group %s: %s", group_id, exc)
@@ -1,40 +1,667 @@
 """Test the WemPortal API."""
-from unittest.mock import patch, MagicMock
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
 import pytest
-import requests
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMockResponse,
+)
 
+from custom_components.wemportal.const import (
+    API_CIRCUIT_TIMES_READ_URL,
+    API_CIRCUIT_TIMES_REFRESH_URL,
+    API_DATA_ACCESS_READ_URL,
+    API_DATA_ACCESS_WRITE_URL,
+    API_DEVICE_READ_URL,
+    API_EVENT_TYPE_READ_URL,
+    API_LOGIN_URL,
+    API_REFRESH_URL,
+    API_STATISTICS_READ_URL,
+    API_STATISTICS_REFRESH_URL,
+    CONF_LANGUAGE,
+    REFRESH_EXPLORE_INTERVAL,
+)
+from custom_components.wemportal.mapper import WemPortalDataMapper
+from custom_components.wemportal.scheduler import RequestScheduler
 from custom_components.wemportal.wemportalapi import WemPortalApi
-from custom_components.wemportal.exceptions import ForbiddenError
+from custom_components.wemportal.exceptions import (
+    ForbiddenError,
+    ParameterChangeError,
+)
+
+
+# Unpatched sleep for simulating slow responses
+_real_sleep = asyncio.sleep
+
+
+@pytest.fixture(autouse=True)
+def skip_sleep():
+    """Skip the pauses between API calls."""
+    with patch("custom_components.wemportal.wemportalapi.asyncio.sleep"):
+        yield
+
+
+@pytest.fixture
+async def api(hass, aioclient_mock):
+    """Return an API object without rate limiting."""
+    return WemPortalApi(
+        "test",
+        "test",
+        session=async_create_clientsession(hass),
+        scheduler=RequestScheduler({"global": (1000.0, 1000)}),
+    )
 
 
-def test_api_login_success():
+async def test_api_login_success(api, aioclient_mock):
     """Test successful API login."""
-    api = WemPortalApi("test", "test", "0000")
-    
-    with patch("custom_components.wemportal.wemportalapi.reqs.Session.post") as mock_post:
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"Status": 0, "Message": "OK"}
-        mock_post.return_value = mock_response
+    aioclient_mock.post(API_LOGIN_URL, json={"Status": 0, "Message": "OK"})
 
-        api.api_login()
-        
-        assert api.valid_login is True
-        mock_post.assert_called_once()
+    await api.api_login()
 
+    assert api.valid_login is True
+    assert aioclient_mock.call_count == 1
 
-def test_api_login_failure():
+
+async def test_api_login_failure(api, aioclient_mock):
     """Test API login failure resulting in ForbiddenError."""
-    api = WemPortalApi("test", "test", "0000")
-    
-    with patch("custom_components.wemportal.wemportalapi.reqs.Session.post") as mock_post:
-        mock_response = MagicMock()
-        mock_response.status_code = 403
-        mock_response.json.return_value = {"Status": 403, "Message": "Forbidden"}
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
-        mock_post.return_value = mock_response
-
-        with pytest.raises(ForbiddenError):
-            api.api_login()
-            
-        assert api.valid_login is False
+    aioclient_mock.post(
+        API_LOGIN_URL, status=403, json={"Status": 403, "Message": "Forbidden"}
+    )
+
+    with pytest.raises(ForbiddenError):
+        await api.api_login()
+
+    assert api.valid_login is False
+
+
+async def test_get_devices(api, aioclient_mock):
+    """Test device and module discovery."""
+    aioclient_mock.get(
+        API_DEVICE_READ_URL,
+        json={
+            "Devices": [
+                {
+                    "ID": 1234,
+                    "ConnectionStatus": 0,
+                    "Modules": [{"Index": 0, "Type": 1, "Name": "Heizkreis"}],
+                }
+            ]
+        },
+    )
+
+    await api.get_devices()
+
+    assert api.data == {"1234": {"ConnectionStatus": 0}}
+    assert api.modules == {
+        "1234": {(0, 1): {"Index": 0, "Type": 1, "Name": "Heizkreis"}}
+    }
+
+
+async def test_expired_session_renewed_once(api, aioclient_mock):
+    """Test concurrent requests on an expired session log in again only once."""
+    logins = []
+
+    async def login(method, url, data):
+        logins.append(url)
+        return AiohttpClientMockResponse(method, url, json={"Status": 0})
+
+    async def read(method, url, data):
+        logged_in = bool(logins)
+        # All requests are in flight before the first 401 arrives
+        await _real_sleep(0.01)
+        if not logged_in:
+            return AiohttpClientMockResponse(method, url, status=401)
+        return AiohttpClientMockResponse(method, url, json={"Status": 0})
+
+    aioclient_mock.post(API_LOGIN_URL, side_effect=login)
+    aioclient_mock.post(API_DATA_ACCESS_READ_URL, side_effect=read)
+
+    results = await asyncio.gather(
+        *(
+            api.make_api_call(API_DATA_ACCESS_READ_URL, data={"DeviceID": 1234}, do_retry=True)
+            for _ in range(4)
+        )
+    )
+
+    assert results == [{"Status": 0}] * 4
+    assert len(logins) == 1
+
+
+async def test_change_value_failure(api, aioclient_mock):
+    """Test a failed write is raised as ParameterChangeError."""
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, status=500)
+
+    with pytest.raises(ParameterChangeError):
+        await api.change_value("1234", "Komfort", 0, 1, 21.5)
+
+
+async def test_change_value_resolves_every_waiter(api, aioclient_mock):
+    """Test a cancelled waiter or a request that cannot be built leaves no waiter hanging."""
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, json={"Status": 0})
+
+    cancelled = asyncio.create_task(api.change_value("1234", "Komfort", 0, 1, 21.0))
+    written = asyncio.create_task(api.change_value("1234", "Absenk", 0, 1, 17.0))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await written
+    assert cancelled.cancelled()
+
+    # The device id is not numeric, so the request body cannot be built
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            api.change_value("invalid", "Komfort", 0, 1, 21.0),
+            api.change_value("invalid", "Absenk", 0, 1, 17.0),
+            return_exceptions=True,
+        ),
+        timeout=5,
+    )
+    assert all(isinstance(result, ParameterChangeError) for result in results)
+    assert aioclient_mock.call_count == 1
+
+
+async def test_change_value_coalesced(api, aioclient_mock):
+    """Test concurrent writes are merged into one request."""
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, json={"Status": 0})
+
+    await asyncio.gather(
+        api.change_value("1234", "Komfort", 0, 1, 21.0),
+        api.change_value("1234", "Absenk", 0, 1, 17.0),
+        api.change_value("1234", "Komfort", 0, 1, 21.5),
+        api.change_value("1234", "Betriebsart", 1, 2, 3),
+    )
+
+    assert aioclient_mock.call_count == 1
+    assert aioclient_mock.mock_calls[0][2] == {
+        "DeviceID": 1234,
+        "Modules": [
+            {
+                "ModuleIndex": 0,
+                "ModuleType": 1,
+                "Parameters": [
+                    {"ParameterID": "Komfort", "NumericValue": 21.5},
+                    {"ParameterID": "Absenk", "NumericValue": 17.0},
+                ],
+            },
+            {
+                "ModuleIndex": 1,
+                "ModuleType": 2,
+                "Parameters": [{"ParameterID": "Betriebsart", "NumericValue": 3.0}],
+            },
+        ],
+    }
+
+
+async def test_change_value_read_back(api, aioclient_mock):
+    """Test only the written parameter is read back and published."""
+    api.data = {"1234": {}}
+    api.modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {
+                    "Komfort": {
+                        "ParameterID": "Komfort",
+                        "DataType": 2,
+                        "IsWriteable": True,
+                        "MinValue": 10,
+                        "MaxValue": 25,
+                    },
+                    "Absenk": {"ParameterID": "Absenk", "DataType": 2, "IsWriteable": True},
+                },
+            }
+        }
+    }
+    published = []
+    api.on_read_back = published.append
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, json={"Status": 0})
+    aioclient_mock.post(API_REFRESH_URL, json={"Status": 0})
+    aioclient_mock.post(
+        API_DATA_ACCESS_READ_URL,
+        json={
+            "Modules": [
+                {
+                    "ModuleIndex": 0,
+                    "ModuleType": 1,
+                    "Values": [{"ParameterID": "Komfort", "NumericValue": 25.0}],
+                }
+            ]
+        },
+    )
+
+    await api.change_value("1234", "Komfort", 0, 1, 30.0)
+    await asyncio.gather(*api._read_back_tasks)
+
+    expected = {
+        "DeviceID": 1234,
+        "Modules": [
+            {"ModuleIndex": 0, "ModuleType": 1, "Parameters": [{"ParameterID": "Komfort"}]}
+        ],
+    }
+    assert aioclient_mock.mock_calls[1][2] == expected
+    assert aioclient_mock.mock_calls[2][2] == expected
+    assert api.data["1234"]["Heizkreis-Komfort"]["value"] == 25.0
+    assert published == [{"1234": {"Heizkreis-Komfort"}}]
+
+
+async def test_close_cancels_background_tasks(api, aioclient_mock):
+    """Test closing the API cancels queued writes and the catalog revalidation."""
+    blocked = asyncio.Event()
+
+    async def write(method, url, data):
+        await blocked.wait()
+        return AiohttpClientMockResponse(method, url, json={"Status": 0})
+
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, side_effect=write)
+    api._revalidate_task = asyncio.create_task(blocked.wait())
+    change = asyncio.create_task(api.change_value("1234", "Komfort", 0, 1, 21.0))
+    await _real_sleep(0.01)
+
+    await api.close()
+
+    with pytest.raises(ParameterChangeError):
+        await asyncio.wait_for(change, timeout=5)
+    assert api._revalidate_task is None
+    assert not api._write_tasks
+    assert not api._flush_tasks
+    assert not api._read_back_tasks
+
+
+async def test_catalog_restored_from_state(hass, aioclient_mock):
+    """Test a persisted catalog is reused without calling Device/Read."""
+    api = WemPortalApi("test", "test", session=async_create_clientsession(hass))
+    api.data = {"1234": {"ConnectionStatus": 0}}
+    api.modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {"Komfort": {"ParameterID": "Komfort", "DataType": 3}},
+            }
+        }
+    }
+    api.catalog_fetched_at = 1.0
+    api.scraping_mapper = {"Vorlauf": ["heating-flow_temperature"]}
+    # Without a scraped match a parameter maps to its own entity
+    WemPortalDataMapper.process_api_values(
+        "1234",
+        {"Modules": [{"ModuleIndex": 0, "ModuleType": 1, "Values": [
+            {"ParameterID": "Komfort", "NumericValue": 21.0}
+        ]}]},
+        api.modules, "en", api.scraping_mapper, "both", api.data,
+        scraping_unmatched=api.scraping_unmatched,
+    )
+    assert "Komfort" in api.scraping_mapper
+    # Mapping plans are rebuilt lazily, e.g. after a catalog revalidation
+    api.mapping_plans = {}
+    state = api.export_state()
+
+    restored = WemPortalApi("test", "test", session=async_create_clientsession(hass))
+    restored.restore_state(state)
+    assert restored.modules == api.modules
+    assert restored.data == {"1234": {"ConnectionStatus": 0}}
+    assert restored.scraping_mapper == {"Vorlauf": ["heating-flow_temperature"]}
+
+    other_language = WemPortalApi(
+        "test", "test", {CONF_LANGUAGE: "de"}, session=async_create_clientsession(hass)
+    )
+    other_language.restore_state(state)
+    assert other_language.scraping_mapper == {}
+
+    other_account = WemPortalApi("other", "test", session=async_create_clientsession(hass))
+    other_account.restore_state(state)
+    assert other_account.modules is None
+
+    await restored.get_devices()
+    assert aioclient_mock.call_count == 0
+
+
+async def test_get_parameters_concurrent(api, aioclient_mock):
+    """Test modules are discovered concurrently and unsupported ones dropped."""
+    api.data = {"1234": {"ConnectionStatus": 0}}
+    api.modules = {
+        "1234": {
+            (index, 1): {"Index": index, "Type": 1, "Name": f"Module {index}"}
+            for index in range(4)
+        }
+    }
+    in_flight = 0
+    max_in_flight = 0
+
+    async def event_type_read(method, url, data):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later modules answer first
+        await _real_sleep(0.01 * (4 - data["ModuleIndex"]))
+        in_flight -= 1
+        if data["ModuleIndex"] == 2:
+            return AiohttpClientMockResponse(method, url, status=400)
+        return AiohttpClientMockResponse(
+            method,
+            url,
+            json={"Parameters": [{"ParameterID": f"P{data['ModuleIndex']}"}]},
+        )
+
+    aioclient_mock.post(API_EVENT_TYPE_READ_URL, side_effect=event_type_read)
+
+    await api.get_parameters()
+
+    assert max_in_flight > 1
+    assert list(api.modules["1234"]) == [(0, 1), (1, 1), (3, 1)]
+    assert api.modules["1234"][(3, 1)]["parameters"] == {"P3": {"ParameterID": "P3"}}
+
+
+async def test_get_parameters_forbidden_strikes(api, aioclient_mock):
+    """Test three 403 responses abort discovery."""
+    api.data = {"1234": {"ConnectionStatus": 0}}
+    api.modules = {
+        "1234": {
+            (index, 1): {"Index": index, "Type": 1, "Name": f"Module {index}"}
+            for index in range(5)
+        }
+    }
+    aioclient_mock.post(API_EVENT_TYPE_READ_URL, status=403)
+
+    with pytest.raises(ForbiddenError):
+        await api.get_parameters()
+
+
+async def test_change_value_rejected_read_back(api, aioclient_mock):
+    """Test a rejected write still publishes the unchanged value read back."""
+    api.modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {
+                    "Komfort": {"ParameterID": "Komfort", "DataType": 2, "IsWriteable": True},
+                },
+            }
+        }
+    }
+    values = {
+        "Modules": [
+            {
+                "ModuleIndex": 0,
+                "ModuleType": 1,
+                "Values": [{"ParameterID": "Komfort", "NumericValue": 20.0}],
+            }
+        ]
+    }
+    api.data = {"1234": {}}
+    WemPortalDataMapper.process_api_values(
+        "1234", values, api.modules, "en", {}, "api", api.data
+    )
+    published = []
+    api.on_read_back = published.append
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, json={"Status": 0})
+    aioclient_mock.post(API_REFRESH_URL, json={"Status": 0})
+    aioclient_mock.post(API_DATA_ACCESS_READ_URL, json=values)
+
+    await api.change_value("1234", "Komfort", 0, 1, 22.0)
+    await asyncio.gather(*api._read_back_tasks)
+
+    assert api.data["1234"]["Heizkreis-Komfort"]["value"] == 20.0
+    assert published == [{"1234": {"Heizkreis-Komfort"}}]
+
+
+async def test_refresh_and_read_waits_for_fresh_values(api, aioclient_mock):
+    """Test reads are only repeated while the portal answers not ready."""
+    payload = {"DeviceID": 1234, "Modules": []}
+    values = {"Modules": [{"ModuleIndex": 0, "Values": [{"NumericValue": 20.0}]}]}
+    changed = {"Modules": [{"ModuleIndex": 0, "Values": [{"NumericValue": 21.0}]}]}
+    not_ready = {"Status": 1, "Modules": []}
+    responses = [values, values, not_ready, {"Modules": [{"ModuleIndex": 0}]}, changed]
+
+    async def read(method, url, data):
+        return AiohttpClientMockResponse(method, url, json=responses.pop(0))
+
+    aioclient_mock.post(API_REFRESH_URL, json={"Status": 0})
+    aioclient_mock.post(API_DATA_ACCESS_READ_URL, side_effect=read)
+
+    assert await api.refresh_and_read("1234", payload) == values
+    assert aioclient_mock.call_count == 2
+
+    # Unchanged values are accepted with the first read
+    assert await api.refresh_and_read("1234", payload) == values
+    assert aioclient_mock.call_count == 4
+    assert "1234" not in api.refresh_latency.latency
+
+    assert await api.refresh_and_read("1234", payload) == changed
+    assert aioclient_mock.call_count == 8
+    assert "1234" in api.refresh_latency.latency
+
+
+async def test_refresh_and_read_learns_shorter_latency(api, aioclient_mock):
+    """Test early probes let the expected latency go down for a fast device."""
+    readings = iter(range(100))
+
+    async def read(method, url, data):
+        # Answers instantly with fresh values
+        value = {"NumericValue": float(next(readings))}
+        return AiohttpClientMockResponse(
+            method, url, json={"Modules": [{"ModuleIndex": 0, "Values": [value]}]}
+        )
+
+    aioclient_mock.post(API_REFRESH_URL, json={"Status": 0})
+    aioclient_mock.post(API_DATA_ACCESS_READ_URL, side_effect=read)
+    payload = {"DeviceID": 1234, "Modules": []}
+
+    expectations = []
+    for _ in range(3 * REFRESH_EXPLORE_INTERVAL):
+        await api.refresh_and_read("1234", payload)
+        expectations.append(api.refresh_latency.expected("1234"))
+
+    assert expectations[0] == 5.0
+    assert expectations == sorted(expectations, reverse=True)
+    assert expectations[-1] < 4.0
+    # One read per cycle, early probes with fresh values need no second read
+    assert aioclient_mock.call_count == 2 * 3 * REFRESH_EXPLORE_INTERVAL
+
+
+def test_is_parameter_needed(api):
+    """Test parameters only backing disabled entities are skipped."""
+    module = {"Name": "WEZ"}
+    api.disabled_keys = {"1234": {"WEZ-Leistung", "scraped-power"}}
+
+    assert api.is_parameter_needed("1234", module, "Temperatur")
+    assert not api.is_parameter_needed("1234", module, "Leistung")
+    assert api.is_parameter_needed("5678", module, "Leistung")
+
+    # In "both" mode the scraped entities matched to a parameter decide
+    api.scraping_mapper = {"Leistung": ["scraped-power", "scraped-output"]}
+    assert api.is_parameter_needed("1234", module, "Leistung")
+    api.scraping_mapper = {"Leistung": ["scraped-power"]}
+    assert not api.is_parameter_needed("1234", module, "Leistung")
+
+
+async def test_poll_tiers_due(hass):
+    """Test only the tiers whose interval elapsed are polled."""
+    api = WemPortalApi(
+        "test",
+        "test",
+        config={
+            "api_scan_interval": 300,
+            "fast_scan_interval": 60,
+            "slow_scan_interval": 3600,
+            "fast_parameters": "Komfort, Absenk",
+        },
+        session=async_create_clientsession(hass),
+    )
+    assert api.poll_tier_overrides == {"komfort": "fast", "absenk": "fast"}
+    assert api._due_poll_tiers("1234") == {"fast", "normal", "slow"}
+
+    now = datetime.now()
+    api.last_tier_poll["1234"] = {
+        "fast": now - timedelta(seconds=120),
+        "normal": now - timedelta(seconds=120),
+        "slow": now - timedelta(seconds=120),
+    }
+    assert api._due_poll_tiers("1234") == {"fast"}
+
+
+async def test_schedules_cached_until_changed(api, aioclient_mock):
+    """Test CircuitTimes are reused until the program value changes or is written."""
+    api.data = {"1234": {}}
+    api.modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {"Zeitprogramm": {"ParameterID": "Zeitprogramm", "DataType": 6}},
+            }
+        }
+    }
+    aioclient_mock.post(API_CIRCUIT_TIMES_REFRESH_URL, json={"JobID": 1})
+    aioclient_mock.post(API_CIRCUIT_TIMES_READ_URL, json={"CircuitTimesDay": [{"Day": 1}]})
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, json={"Status": 0})
+    key = "1234:0:1:Zeitprogramm"
+
+    await api.get_schedules("1234", {key: [1.0, "1"]})
+    assert aioclient_mock.call_count == 2
+    assert api.data["1234"]["Heizkreis-Zeitprogramm"]["CircuitTimesDay"] == [{"Day": 1}]
+
+    api.data = {"1234": {}}
+    await api.get_schedules("1234", {key: [1.0, "1"]})
+    assert aioclient_mock.call_count == 2
+    assert api.data["1234"]["Heizkreis-Zeitprogramm"]["CircuitTimesDay"] == [{"Day": 1}]
+
+    await api.get_schedules("1234", {key: [2.0, "2"]})
+    assert aioclient_mock.call_count == 4
+
+    await api.change_value("1234", "Zeitprogramm", 0, 1, 2.0)
+    await api.get_schedules("1234", {key: [2.0, "2"]})
+    assert aioclient_mock.call_count == 7
+
+
+async def test_schedules_pipelined(api, aioclient_mock):
+    """Test all CircuitTimes jobs are started before any is read."""
+    api.data = {"1234": {}}
+    api.modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {
+                    f"Programm{index}": {"ParameterID": f"Programm{index}", "DataType": 6}
+                    for index in range(3)
+                },
+            }
+        }
+    }
+    not_ready = {"Programm1"}
+
+    async def read(method, url, data):
+        if data["ParameterID"] in not_ready:
+            not_ready.discard(data["ParameterID"])
+            return AiohttpClientMockResponse(method, url, json={"Status": 0})
+        return AiohttpClientMockResponse(
+            method, url, json={"CircuitTimesDay": [{"Day": data["JobID"]}]}
+        )
+
+    async def refresh(method, url, data):
+        return AiohttpClientMockResponse(
+            method, url, json={"JobID": int(data["ParameterID"][-1])}
+        )
+
+    aioclient_mock.post(API_CIRCUIT_TIMES_REFRESH_URL, side_effect=refresh)
+    aioclient_mock.post(API_CIRCUIT_TIMES_READ_URL, side_effect=read)
+
+    await api.get_schedules("1234")
+
+    urls = [str(call[1]) for call in aioclient_mock.mock_calls]
+    assert urls == [API_CIRCUIT_TIMES_REFRESH_URL] * 3 + [API_CIRCUIT_TIMES_READ_URL] * 4
+    for index in range(3):
+        assert api.data["1234"][f"Heizkreis-Programm{index}"]["CircuitTimesDay"] == [
+            {"Day": index}
+        ]
+
+
+async def test_statistics_fetch_state_persisted(hass, api, aioclient_mock):
+    """Test restored statistics are reused until they are due."""
+    api.data = {"1234": {}}
+    aioclient_mock.post(
+        API_STATISTICS_REFRESH_URL,
+        json={"GroupTypeDescriptions": [{"GroupType": 1, "Description": ""}]},
+    )
+    aioclient_mock.post(
+        API_STATISTICS_READ_URL, json={"Unit": "kWh", "Values": [{"Value": 4.5}]}
+    )
+
+    await api.get_statistics()
+    assert aioclient_mock.call_count == 2
+    assert api.data["1234"]["1234-Energy_1"]["value"] == 4.5
+
+    restored = WemPortalApi(
+        "test",
+        "test",
+        session=async_create_clientsession(hass),
+        scheduler=RequestScheduler({"global": (1000.0, 1000)}),
+    )
+    restored.data = {"1234": {}}
+    restored.restore_state(api.export_state())
+    await restored.get_statistics()
+    assert aioclient_mock.call_count == 2
+    assert restored.data["1234"]["1234-Energy_1"]["value"] == 4.5
+
+    restored.statistics_cache["1234:1"]["fetched_at"] -= 3600
+    await restored.get_statistics()
+    assert aioclient_mock.call_count == 4
+
+
+def test_changed_modules(api):
+    """Test only modules whose values changed are mapped again."""
+    values = {
+        "Modules": [
+            {"ModuleIndex": 0, "ModuleType": 1, "Values": [{"ParameterID": "A", "NumericValue": 1.0}]},
+            {"ModuleIndex": 1, "ModuleType": 1, "Values": [{"ParameterID": "B", "NumericValue": 2.0}]},
+        ]
+    }
+    assert api._changed_modules("1234", values) == values
+    assert api._changed_modules("1234", values)["Modules"] == []
+
+    values["Modules"][1]["Values"][0]["NumericValue"] = 2.5
+    assert api._changed_modules("1234", values)["Modules"] == [values["Modules"][1]]
+
+
+async def test_unconfirmed_write_published_by_next_read(api, aioclient_mock):
+    """Test a written key is published by the next read whose values are unchanged."""
+    api.data = {"1234": {}}
+    api.modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {
+                    "Komfort": {"ParameterID": "Komfort", "DataType": 2, "IsWriteable": True},
+                },
+            }
+        }
+    }
+    aioclient_mock.post(API_DATA_ACCESS_WRITE_URL, json={"Status": 0})
+    aioclient_mock.post(API_REFRESH_URL, status=500)
+
+    await api.change_value("1234", "Komfort", 0, 1, 22.0)
+    # The read-back fails, so the write stays unconfirmed
+    await asyncio.gather(*api._read_back_tasks)
+
+    values = {
+        "Modules": [
+            {
+                "ModuleIndex": 0,
+                "ModuleType": 1,
+                "Values": [{"ParameterID": "Komfort", "NumericValue": 20.0}],
+            }
+        ]
+    }
+    assert api._pop_written_keys("1234", values) == {"Heizkreis-Komfort"}
+    assert api._pop_written_keys("1234", values) == set()
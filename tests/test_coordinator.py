@@ -1,10 +1,16 @@
 """Test the wemportal coordinator."""
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import copy
 from datetime import timedelta
 
 import pytest
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.core import Event
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wemportal.const import DOMAIN
 
 from custom_components.wemportal.coordinator import WemPortalDataUpdateCoordinator
 from custom_components.wemportal.exceptions import WemPortalError, AuthError
@@ -13,6 +19,7 @@ from custom_components.wemportal.exceptions import WemPortalError, AuthError
 async def test_coordinator_update_success(hass):
     """Test successful coordinator update."""
     api_mock = MagicMock()
+    api_mock.fetch_data = AsyncMock()
     api_mock.fetch_data.return_value = {"0000": {"sensor1": {"value": 10}}}
 
     coordinator = WemPortalDataUpdateCoordinator(
@@ -29,9 +36,45 @@ async def test_coordinator_update_success(hass):
     assert coordinator.num_failed == 0
 
 
+async def test_coordinator_only_changed_entities_updated(hass):
+    """Test listeners are only called for changed data keys."""
+    api_mock = MagicMock()
+    data = {"0000": {"sensor1": {"value": 10}, "sensor2": {"value": 20}}}
+    api_mock.fetch_data = AsyncMock(return_value=data)
+    api_mock.changed_keys = {"0000": {"sensor1", "sensor2"}}
+
+    coordinator = WemPortalDataUpdateCoordinator(
+        hass,
+        api_mock,
+        None,
+        timedelta(seconds=30),
+    )
+    sensor1 = MagicMock()
+    sensor2 = MagicMock()
+    unsub1 = coordinator.async_add_listener(sensor1, ("0000", "sensor1"))
+    unsub2 = coordinator.async_add_listener(sensor2, ("0000", "sensor2"))
+
+    await coordinator.async_refresh()
+    assert (sensor1.call_count, sensor2.call_count) == (1, 1)
+
+    api_mock.changed_keys = {"0000": {"sensor2"}}
+    await coordinator.async_refresh()
+    assert (sensor1.call_count, sensor2.call_count) == (1, 2)
+
+    api_mock.changed_keys = {}
+    await coordinator.async_refresh()
+    assert (sensor1.call_count, sensor2.call_count) == (1, 2)
+
+    coordinator.async_handle_read_back({"0000": {"sensor1"}})
+    assert (sensor1.call_count, sensor2.call_count) == (2, 2)
+    unsub1()
+    unsub2()
+
+
 async def test_coordinator_update_failed(hass):
     """Test coordinator gracefully handles WemPortalError."""
     api_mock = MagicMock()
+    api_mock.fetch_data = AsyncMock()
     api_mock.fetch_data.side_effect = WemPortalError("Mocked API Error")
 
     coordinator = WemPortalDataUpdateCoordinator(
@@ -51,6 +94,7 @@ async def test_coordinator_auth_failed(hass):
     """Test coordinator handles AuthError by raising ConfigEntryAuthFailed."""
     api_mock = MagicMock()
     api_mock.data = {"0000": {}}
+    api_mock.fetch_data = AsyncMock()
     api_mock.fetch_data.side_effect = AuthError("Mocked Auth Error")
 
     coordinator = WemPortalDataUpdateCoordinator(
@@ -71,6 +115,7 @@ async def test_coordinator_disabled_devices(hass):
     """Test coordinator filters out disabled devices."""
     api_mock = MagicMock()
     api_mock.data = {"1234": {}, "5678": {}}
+    api_mock.fetch_data = AsyncMock()
     api_mock.fetch_data.return_value = {"1234": {}}
 
     coordinator = WemPortalDataUpdateCoordinator(
@@ -97,4 +142,79 @@ async def test_coordinator_disabled_devices(hass):
 
         await coordinator.async_refresh()
 
-        api_mock.fetch_data.assert_called_once_with(["1234"])
+        api_mock.fetch_data.assert_awaited_once_with(["1234"])
+
+
+async def test_coordinator_disabled_keys(hass):
+    """Test parameters whose entities are all disabled are reported to the API."""
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="entry")
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    registry.async_get_or_create(
+        "sensor", DOMAIN, "entry:1234:WEZ-Leistung", config_entry=entry,
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    registry.async_get_or_create(
+        "sensor", DOMAIN, "entry:1234:WEZ-Temperatur", config_entry=entry
+    )
+    api_mock = MagicMock()
+
+    coordinator = WemPortalDataUpdateCoordinator(
+        hass, api_mock, entry, timedelta(seconds=30)
+    )
+    coordinator.async_update_disabled_keys()
+
+    assert api_mock.disabled_keys == {"1234": {"WEZ-Leistung"}}
+
+
+async def test_coordinator_saves_changed_state_only(hass):
+    """Test the API state is only written when it changed since the last save."""
+    api_mock = MagicMock()
+    api_mock.fetch_data = AsyncMock(return_value={"0000": {"sensor1": {"value": 10}}})
+    state = {"account": "test", "backoff": {"rate": 1.0}}
+    api_mock.export_state.side_effect = lambda: copy.deepcopy(state)
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=state)
+
+    coordinator = WemPortalDataUpdateCoordinator(
+        hass, api_mock, None, timedelta(seconds=30), store
+    )
+    await coordinator.async_load_state()
+    await coordinator.async_refresh()
+    store.async_delay_save.assert_not_called()
+
+    state["backoff"]["rate"] = 0.5
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    store.async_delay_save.assert_called_once()
+
+
+async def test_coordinator_filters_entity_registry_events(hass):
+    """Test only registry events of this config entry's entities are handled."""
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="entry")
+    entry.add_to_hass(hass)
+    other_entry = MockConfigEntry(domain="other", entry_id="other")
+    other_entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    own = registry.async_get_or_create(
+        "sensor", DOMAIN, "entry:1234:WEZ-Leistung", config_entry=entry
+    )
+    other = registry.async_get_or_create(
+        "sensor", "other", "sensor", config_entry=other_entry
+    )
+
+    coordinator = WemPortalDataUpdateCoordinator(
+        hass, MagicMock(), entry, timedelta(seconds=30)
+    )
+    coordinator.async_update_disabled_keys()
+    registry.async_remove(own.entity_id)
+
+    def event(entity_id, action="update"):
+        return Event(er.EVENT_ENTITY_REGISTRY_UPDATED, {"action": action, "entity_id": entity_id})
+
+    assert coordinator.async_filter_entity_registry_updated(event(own.entity_id, "remove"))
+    assert not coordinator.async_filter_entity_registry_updated(event(other.entity_id))
+    created = registry.async_get_or_create(
+        "sensor", DOMAIN, "entry:1234:WEZ-Temperatur", config_entry=entry
+    )
+    assert coordinator.async_filter_entity_registry_updated(event(created.entity_id, "create"))
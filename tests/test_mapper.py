@@ -0,0 +1,163 @@
+"""Test the WemPortal data mapper."""
+from custom_components.wemportal.const import (
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_SLOW,
+    WemDataType,
+)
+from custom_components.wemportal.mapper import (
+    ScrapedTokenIndex,
+    WemPortalDataMapper,
+    compile_mapping_plan,
+    get_poll_tier,
+)
+
+
+def test_get_poll_tier():
+    """Test poll tiers are derived from parameter metadata."""
+    assert get_poll_tier({"ParameterID": "Vorlauf"}, "°C", {}) == POLL_TIER_FAST
+    assert get_poll_tier({"ParameterID": "Drehzahl"}, "%", {}) == POLL_TIER_FAST
+    assert get_poll_tier({"ParameterID": "Druck"}, "bar", {}) == POLL_TIER_NORMAL
+    assert get_poll_tier({"ParameterID": "Status"}, None, {}) == POLL_TIER_NORMAL
+    assert (
+        get_poll_tier({"ParameterID": "Komfort", "IsWriteable": True}, "°C", {})
+        == POLL_TIER_SLOW
+    )
+    assert (
+        get_poll_tier({"ParameterID": "Betriebsart", "EnumValues": [{}]}, None, {})
+        == POLL_TIER_SLOW
+    )
+    assert (
+        get_poll_tier({"ParameterID": "Programm", "DataType": WemDataType.PROGRAM}, None, {})
+        == POLL_TIER_SLOW
+    )
+
+
+def test_get_poll_tier_overrides():
+    """Test user overrides win over the derived tier."""
+    overrides = {"komfort": POLL_TIER_FAST, "vorlauf": POLL_TIER_SLOW}
+    assert (
+        get_poll_tier({"ParameterID": "Komfort", "IsWriteable": True}, "°C", overrides)
+        == POLL_TIER_FAST
+    )
+    assert get_poll_tier({"ParameterID": "Vorlauf"}, "°C", overrides) == POLL_TIER_SLOW
+
+
+def test_process_api_values_with_plan():
+    """Test values are mapped to platforms through the compiled plan."""
+    modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {
+                    "Komfort": {
+                        "ParameterID": "Komfort",
+                        "DataType": WemDataType.NUMBER_STEP_HALF,
+                        "IsWriteable": True,
+                        "MinValue": 10,
+                        "MaxValue": 30,
+                    },
+                    "Betriebsart": {
+                        "ParameterID": "Betriebsart",
+                        "DataType": WemDataType.SELECT,
+                        "IsWriteable": True,
+                        "EnumValues": [{"Value": 1, "Name": "Aus"}, {"Value": 2, "Name": "Auto"}],
+                    },
+                    "Vorlauf": {"ParameterID": "Vorlauf", "DataType": 1},
+                },
+            }
+        }
+    }
+    values = {
+        "Modules": [
+            {
+                "ModuleIndex": 0,
+                "ModuleType": 1,
+                "Values": [
+                    {"ParameterID": "Komfort", "NumericValue": 21.5, "Unit": "°C"},
+                    {"ParameterID": "Betriebsart", "NumericValue": 2, "StringValue": "Auto"},
+                    {"ParameterID": "Vorlauf", "NumericValue": 35.0, "Unit": "°C"},
+                    {"ParameterID": "Unbekannt", "NumericValue": 1.0},
+                ],
+            }
+        ]
+    }
+    plan = compile_mapping_plan(modules["1234"], "en")
+    api_data = {"1234": {}}
+
+    WemPortalDataMapper.process_api_values(
+        "1234", values, modules, "en", {}, "api", api_data, mapping_plan=plan
+    )
+
+    komfort = api_data["1234"]["Heizkreis-Komfort"]
+    assert komfort["platform"] == "number"
+    assert (komfort["min_value"], komfort["max_value"], komfort["step"]) == (10.0, 30.0, 0.5)
+    assert komfort["value"] == 21.5
+    betriebsart = api_data["1234"]["Heizkreis-Betriebsart"]
+    assert betriebsart["platform"] == "select"
+    assert betriebsart["options"] == [1, 2]
+    assert betriebsart["value"] == "Auto"
+    vorlauf = api_data["1234"]["Heizkreis-Vorlauf"]
+    assert vorlauf["platform"] == "sensor"
+    assert vorlauf["icon"] == "mdi:thermometer"
+    assert len(api_data["1234"]) == 3
+
+
+def test_process_api_values_switch_schedule_is_sensor():
+    """Test a SWITCH parameter holding a JSON schedule is a sensor whatever its range."""
+    modules = {
+        "1234": {
+            (0, 1): {
+                "Index": 0,
+                "Type": 1,
+                "Name": "Heizkreis",
+                "parameters": {
+                    "Zeitprogramm": {
+                        "ParameterID": "Zeitprogramm",
+                        "DataType": WemDataType.SWITCH,
+                        "IsWriteable": True,
+                        "MinValue": 0,
+                        "MaxValue": 7,
+                    },
+                },
+            }
+        }
+    }
+    values = {
+        "Modules": [
+            {
+                "ModuleIndex": 0,
+                "ModuleType": 1,
+                "Values": [{"ParameterID": "Zeitprogramm", "StringValue": '{"a":1}'}],
+            }
+        ]
+    }
+    api_data = {"1234": {}}
+
+    WemPortalDataMapper.process_api_values("1234", values, modules, "en", {}, "api", api_data)
+
+    assert api_data["1234"]["Heizkreis-Zeitprogramm"]["platform"] == "sensor"
+
+
+def test_scraped_token_index():
+    """Test scraped entities match when all their name tokens are in the sensor name."""
+    device_data = {
+        "heating-Außentemperatur": {"ParameterID": "heating-Außentemperatur"},
+        "heating-Vorlauftemperatur": {"ParameterID": "heating-Vorlauftemperatur"},
+        "heating-Temperatur": {"ParameterID": "heating-Temperatur"},
+        "Heizkreis-Vorlauf": {"ParameterID": "Vorlauf"},
+        "ConnectionStatus": 0,
+    }
+    index = ScrapedTokenIndex(device_data, "en")
+
+    assert index.match("Heating circuit flow temperature") == [
+        "heating-Vorlauftemperatur",
+        "heating-Temperatur",
+    ]
+    assert index.match("Outside temperature") == [
+        "heating-Außentemperatur",
+        "heating-Temperatur",
+    ]
+    assert index.match("Pressure") == []
@@ -0,0 +1,162 @@
+"""Test the WemPortal request scheduler."""
+from time import monotonic
+from unittest.mock import patch
+
+import asyncio
+
+from custom_components.wemportal.const import (
+    API_BACKOFF_COOLDOWN,
+    API_BACKOFF_LIMIT_TTL,
+    API_DATA_ACCESS_READ_URL,
+    API_DATA_ACCESS_WRITE_URL,
+    API_LOGIN_URL,
+)
+from custom_components.wemportal.scheduler import (
+    AdaptiveBackoff,
+    RefreshLatencyTracker,
+    RequestScheduler,
+    TokenBucket,
+)
+
+
+async def test_token_bucket_burst_then_refill():
+    """Test the burst is served immediately and further tokens wait for refill."""
+    bucket = TokenBucket(rate=50.0, burst=3)
+
+    start = monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert monotonic() - start < 0.01
+
+    for _ in range(3):
+        await bucket.acquire()
+    # Three extra tokens at 50/s need at least 60 ms of refill
+    assert monotonic() - start >= 0.05
+
+
+async def test_scheduler_uses_endpoint_class_bucket():
+    """Test an endpoint class bucket throttles independently of the global one."""
+    scheduler = RequestScheduler(
+        {"global": (1000.0, 100), "auth": (20.0, 1), "data": (1000.0, 100)}
+    )
+
+    start = monotonic()
+    for _ in range(5):
+        await scheduler.acquire(API_DATA_ACCESS_READ_URL)
+    assert monotonic() - start < 0.01
+
+    await scheduler.acquire(API_LOGIN_URL)
+    await scheduler.acquire(API_LOGIN_URL)
+    assert monotonic() - start >= 0.04
+
+
+async def test_scheduler_writes_jump_queue():
+    """Test a write is served before polling requests that queued earlier."""
+    scheduler = RequestScheduler({"global": (100.0, 1)})
+    order = []
+
+    async def request(name, url):
+        await scheduler.acquire(url)
+        order.append(name)
+
+    polls = [
+        asyncio.create_task(request(f"poll{index}", API_DATA_ACCESS_READ_URL))
+        for index in range(4)
+    ]
+    await asyncio.sleep(0)
+    write = asyncio.create_task(request("write", API_DATA_ACCESS_WRITE_URL))
+    await asyncio.gather(*polls, write)
+
+    assert order == ["poll0", "write", "poll1", "poll2", "poll3"]
+
+
+def test_adaptive_backoff_aimd():
+    """Test rate limits halve the rate and successes slowly restore it."""
+    bucket = TokenBucket(rate=1.0, burst=3)
+    backoff = AdaptiveBackoff(bucket, min_rate=0.1, increase=0.1)
+
+    backoff.record_limited()
+    assert bucket.rate == 0.5
+    assert backoff.limit_rate == 1.0
+    assert len(backoff.limited_at) == 1
+
+    # Recovery stops below the rate that triggered the limit
+    with patch(
+        "custom_components.wemportal.scheduler.time.time",
+        return_value=backoff.limited_at[-1],
+    ):
+        for _ in range(10):
+            backoff.record_success()
+    assert abs(bucket.rate - 0.8) < 1e-9
+
+    # The limit is forgotten as it ages
+    with patch(
+        "custom_components.wemportal.scheduler.time.time",
+        return_value=backoff.limited_at[-1] + API_BACKOFF_LIMIT_TTL,
+    ):
+        for _ in range(30):
+            backoff.record_success()
+    assert abs(bucket.rate - 1.0) < 1e-9
+
+    # Separate episodes keep halving the rate
+    start = backoff.limited_at[-1]
+    for episode in range(1, 11):
+        with patch(
+            "custom_components.wemportal.scheduler.time.time",
+            return_value=start + episode * 2 * API_BACKOFF_COOLDOWN,
+        ):
+            backoff.record_limited()
+    assert bucket.rate == 0.1
+
+
+def test_adaptive_backoff_one_decrease_per_episode():
+    """Test 403s of one burst of concurrent requests decrease the rate once."""
+    bucket = TokenBucket(rate=1.0, burst=3)
+    backoff = AdaptiveBackoff(bucket, min_rate=0.01)
+
+    for _ in range(4):
+        backoff.record_limited()
+    assert bucket.rate == 0.5
+    assert backoff.limit_rate == 1.0
+    assert len(backoff.limited_at) == 1
+
+    # A request sent before the decrease is still part of the episode
+    sent_at = backoff.limited_at[-1] - 1
+    with patch(
+        "custom_components.wemportal.scheduler.time.time",
+        return_value=backoff.limited_at[-1] + 2 * API_BACKOFF_COOLDOWN,
+    ):
+        backoff.record_limited(sent_at)
+        assert bucket.rate == 0.5
+        backoff.record_limited()
+    assert bucket.rate == 0.25
+    assert backoff.limit_rate == 0.5
+
+
+def test_adaptive_backoff_restore():
+    """Test the learned rate survives a restart."""
+    backoff = AdaptiveBackoff(TokenBucket(rate=1.0, burst=3))
+    backoff.record_limited()
+
+    restored = AdaptiveBackoff(TokenBucket(rate=1.0, burst=3))
+    restored.restore(backoff.as_dict())
+
+    assert restored.bucket.rate == 0.5
+    assert restored.limit_rate == 1.0
+    assert restored.limited_at == backoff.limited_at
+
+
+def test_refresh_latency_tracker():
+    """Test the first probe follows the learned latency."""
+    tracker = RefreshLatencyTracker(alpha=0.5)
+    assert tracker.probe_delays("1234", 3) == [5.0, 1.25, 2.5]
+
+    tracker.record("1234", 2.0)
+    tracker.record("1234", 1.0)
+    assert tracker.expected("1234") == 1.5
+    assert tracker.probe_delays("1234", 2) == [1.5, 0.5]
+
+    # Every explore_every-th refresh probes early first
+    tracker = RefreshLatencyTracker(explore_every=2)
+    assert tracker.probe_delays("1234", 2) == [5.0, 1.25]
+    assert tracker.probe_delays("1234", 2) == [2.5, 2.5, 1.25]
@@ -0,0 +1,191 @@
+"""Test the WemPortal web scraper."""
+from unittest.mock import AsyncMock, patch
+
+from custom_components.wemportal.const import WEB_LOGIN_URL, WEB_MAIN_URL
+from custom_components.wemportal.scraper import WemPortalScraper
+
+FORM_PAGE = (
+    '<html><body><form>'
+    '<input id="__VIEWSTATE" value="vs"/>'
+    '<input id="__EVENTVALIDATION" value="ev"/>'
+    '</form></body></html>'
+)
+
+EXPERT_PAGE = (
+    '<html><body>'
+    '<input id="__VIEWSTATE" value="expert"/>'
+    '<input id="__EVENTVALIDATION" value="ev"/>'
+    '<div class="RadPanelBar RadPanelBar_Default rpbSimpleData"><table><tr>'
+    '<th class="simpleDataHeaderTextCell"><span>Heizkreis</span></th></tr></table>'
+    '<div class="rpTemplate"><table class="simpleDataTable"><tbody><tr>'
+    '<td class="simpleDataNameCell"><span>Vorlauftemperatur</span></td>'
+    '<td class="simpleDataValueCell"><span>35,5 °C</span></td>'
+    '</tr></tbody></table></div></div>'
+    '</body></html>'
+)
+
+# The User tab shows the flow temperature too, next to a value of its own
+USER_PAGE = EXPERT_PAGE.replace("35,5 °C", "99 °C").replace(
+    "</tbody>",
+    '<tr><td class="simpleDataNameCell"><span>Raumtemperatur</span></td>'
+    '<td class="simpleDataValueCell"><span>21,0 °C</span></td></tr></tbody>',
+)
+
+
+class FakeResponse:
+    """Streamed response, delivered in small chunks."""
+
+    charset_encoding = "utf-8"
+
+    def __init__(self, url, status_code, text):
+        self.url = url
+        self.status_code = status_code
+        self.content = text.encode()
+
+    async def aiter_content(self):
+        for start in range(0, len(self.content), 7):
+            yield self.content[start:start + 7]
+
+    async def aclose(self):
+        pass
+
+
+class FakePortal:
+    """Replays the WEM Portal pages and records the requests."""
+
+    def __init__(self, session_valid):
+        self.session_valid = session_valid
+        self.viewstates = {"vs", "expert"}
+        self.requests = []
+
+    def response(self, url, text, status_code=200):
+        return FakeResponse(url, status_code, text)
+
+    async def get(self, url, **kwargs):
+        self.requests.append(("GET", url))
+        if url == WEB_MAIN_URL and not self.session_valid:
+            return self.response(f"{WEB_LOGIN_URL}?ReturnUrl=%2fWeb%2fDefault.aspx", FORM_PAGE)
+        return self.response(url, FORM_PAGE)
+
+    async def post(self, url, **kwargs):
+        self.requests.append(("POST", url, kwargs.get("data", {}).get("__EVENTARGUMENT")))
+        if url == WEB_LOGIN_URL:
+            self.session_valid = True
+            return self.response(WEB_MAIN_URL, FORM_PAGE)
+        if kwargs["data"]["__VIEWSTATE"] not in self.viewstates:
+            return self.response(url, "Validation of viewstate MAC failed.", 500)
+        if kwargs["data"]["__EVENTARGUMENT"] == "2":
+            return self.response(url, USER_PAGE)
+        return self.response(url, EXPERT_PAGE)
+
+
+def scraper_for(portal, cookie, tabs=("expert",)):
+    scraper = WemPortalScraper("user", "password", cookie, tabs)
+    scraper.session.get = portal.get
+    scraper.session.post = portal.post
+    return scraper
+
+
+async def test_scrape_reuses_session_cookie():
+    """Test a saved session cookie skips the login."""
+    portal = FakePortal(session_valid=True)
+    scraper = scraper_for(portal, {"ASP.NET_SessionId": "abc"})
+
+    with patch("custom_components.wemportal.scraper.asyncio.sleep", AsyncMock()) as sleep:
+        output = (await scraper.scrape())[0]
+
+    assert portal.requests == [("GET", WEB_MAIN_URL), ("POST", WEB_MAIN_URL, "3")]
+    sleep.assert_not_called()
+    assert output["heizkreis-vorlauftemperatur"]["value"] == 35.5
+    assert output["cookie"] == {"ASP.NET_SessionId": "abc"}
+
+
+async def test_scrape_logs_in_when_session_expired():
+    """Test a redirect to the login page falls back to the full login."""
+    portal = FakePortal(session_valid=False)
+    scraper = scraper_for(portal, {"ASP.NET_SessionId": "expired"})
+
+    with patch("custom_components.wemportal.scraper.asyncio.sleep", AsyncMock()):
+        output = (await scraper.scrape())[0]
+
+    assert portal.requests == [
+        ("GET", WEB_MAIN_URL),
+        ("GET", WEB_LOGIN_URL),
+        ("POST", WEB_LOGIN_URL, None),
+        ("GET", WEB_MAIN_URL),
+        ("POST", WEB_MAIN_URL, "3"),
+    ]
+    assert "heizkreis-vorlauftemperatur" in output
+
+
+def test_parse_expert_page_values():
+    """Test units, missing values and booleans of the Expert page rows."""
+    rows = [
+        ("Vorlauftemperatur", "35,5 °C"),
+        ("Leistungsanforderung", "45"),
+        ("Wärmemenge", "--"),
+        ("Pumpe", "--"),
+        ("Brenner", "Aus"),
+        ("Betriebsart", "Automatik"),
+    ]
+    page = EXPERT_PAGE.replace(
+        '<tr><td class="simpleDataNameCell"><span>Vorlauftemperatur</span></td>'
+        '<td class="simpleDataValueCell"><span>35,5 °C</span></td></tr>',
+        "".join(
+            f'<tr><td class="simpleDataNameCell"><span>{name}</span></td>'
+            f'<td class="simpleDataValueEnumCell"><span>{value}</span></td></tr>'
+            for name, value in rows
+        ),
+    )
+
+    output = WemPortalScraper("user", "password").parse_expert_page(page)[0]
+
+    assert output["heizkreis-vorlauftemperatur"]["unit"] == "°C"
+    assert output["heizkreis-vorlauftemperatur"]["icon"] == "mdi:thermometer"
+    assert output["heizkreis-leistungsanforderung"]["unit"] == "%"
+    assert output["heizkreis-leistungsanforderung"]["icon"] == "mdi:flash"
+    assert output["heizkreis-wärmemenge"]["value"] is None
+    assert output["heizkreis-pumpe"]["value"] == 0.0
+    assert output["heizkreis-brenner"]["value"] == 0.0
+    assert output["heizkreis-betriebsart"]["value"] == "Automatik"
+    assert output["heizkreis-betriebsart"]["unit"] is None
+
+
+async def test_scrape_posts_cached_viewstate():
+    """Test the next scrape posts the cached form state without loading the main page."""
+    portal = FakePortal(session_valid=True)
+    scraper = scraper_for(portal, {"ASP.NET_SessionId": "abc"})
+    await scraper.scrape()
+    assert scraper.form_state["__VIEWSTATE"] == "expert"
+
+    portal.requests.clear()
+    output = (await scraper.scrape())[0]
+    assert portal.requests == [("POST", WEB_MAIN_URL, "3")]
+    assert "heizkreis-vorlauftemperatur" in output
+
+    # A rejected ViewState falls back to loading the main page
+    portal.viewstates = {"vs"}
+    portal.requests.clear()
+    output = (await scraper.scrape())[0]
+    assert portal.requests == [
+        ("POST", WEB_MAIN_URL, "3"),
+        ("GET", WEB_MAIN_URL),
+        ("POST", WEB_MAIN_URL, "3"),
+    ]
+    assert "heizkreis-vorlauftemperatur" in output
+
+
+async def test_scrape_tabs_concurrently():
+    """Test every tab is selected on the same form state and merged, Expert values first."""
+    portal = FakePortal(session_valid=True)
+    scraper = scraper_for(portal, {"ASP.NET_SessionId": "abc"}, ("user", "expert"))
+
+    output = (await scraper.scrape())[0]
+
+    assert portal.requests == [
+        ("GET", WEB_MAIN_URL),
+        ("POST", WEB_MAIN_URL, "3"),
+        ("POST", WEB_MAIN_URL, "2"),
+    ]
+    assert output["heizkreis-vorlauftemperatur"]["value"] == 35.5
+    assert output["heizkreis-raumtemperatur"]["value"] == 21.0
@@ -0,0 +1,49 @@
+"""Test the WemPortal statistics import."""
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.wemportal.statistics import (
+    daily_points,
+    new_statistics,
+    statistic_id,
+)
+
+
+def test_daily_points_skip_current_day():
+    """Test the series is dated backwards from today and today is left out."""
+    today = dt_util.start_of_local_day()
+    values = [{"Value": 1.5}, {"Value": 2.0}, {"Value": 0.5}]
+
+    assert daily_points(values, today) == [
+        (dt_util.start_of_local_day(today.date() - timedelta(days=2)), 1.5),
+        (dt_util.start_of_local_day(today.date() - timedelta(days=1)), 2.0),
+    ]
+
+
+def test_new_statistics_high_water_mark():
+    """Test only days after the mark are imported and the sum continues."""
+    today = dt_util.start_of_local_day()
+    series = {"values": [{"Value": 1.0}, {"Value": 2.0}, {"Value": 3.0}, {"Value": 9.0}]}
+
+    rows, mark = new_statistics(series, None, today)
+    assert [row["sum"] for row in rows] == [1.0, 3.0, 6.0]
+    yesterday = dt_util.start_of_local_day(today.date() - timedelta(days=1))
+    assert mark == {"start": yesterday.timestamp(), "sum": 6.0}
+
+    rows, same_mark = new_statistics(series, mark, today)
+    assert rows == []
+    assert same_mark is mark
+
+    # A day later the series has moved by one value
+    series = {"values": [{"Value": 2.0}, {"Value": 3.0}, {"Value": 4.0}, {"Value": 0.0}]}
+    rows, mark = new_statistics(
+        series, mark, dt_util.start_of_local_day(today.date() + timedelta(days=1))
+    )
+    assert rows == [{"start": today, "state": 4.0, "sum": 10.0}]
+    assert mark == {"start": today.timestamp(), "sum": 10.0}
+
+
+def test_statistic_id():
+    """Test external statistic ids are valid."""
+    assert statistic_id("1234", 5) == "wemportal:1234_energy_5"
@@ -0,0 +1,13 @@
+"""Test the WemPortal translations."""
+from custom_components.wemportal.translations import friendly_name_mapper, translate
+
+
+def test_translate():
+    """Test longer compound words are translated before their parts."""
+    assert translate("en", "Raumsolltemperatur") == "Room Setpoint Temperature"
+    assert translate("en", friendly_name_mapper("AktWWSoll")) == "Hot Water Setpoint Temperature"
+    assert translate("en", "1.WEZ Leistung") == "1st Heat Generator Output"
+    assert translate("en", "Heizkreis 2") == "Heating Circuit 2"
+    # Overlapping words keep the longest-first replacement order
+    assert translate("en", "kühleistung") == "Küh Output"
+    assert translate("de", "Vorlauf_Soll") == "Vorlauf Soll"